@@ -0,0 +1,305 @@
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+# Truck allocation: each route can be covered by buying a truck whose power is at least the minimal power of the route,
+# which brings profit = utility of the route - cost of the truck. We look for the set of routes maximising the profit
+# with a total cost at most the budget: a 0/1 knapsack whose weights are the truck costs.
+# A DP over all the budget values (25*10**9) is out of reach, hence the methods below:
+#  - greedy: items by decreasing profit/cost ratio, O(N log N), at least half of the optimum
+#  - bnb: exact branch and bound (with a limit on the number of nodes)
+#  - dp: DP on costs rounded up to a unit chosen so that the table fits in memory_cap (exact when the unit is 1,
+#    otherwise the greedy allocation is returned if it is better)
+# All of them report the profit found against the fractional (Dantzig) upper bound of the problem.
+
+
+def read_trucks_file(filename):
+    """
+    Reads a trucks.x.in file: a first line with the number of trucks T, then T lines 'power cost'.
+    Returns the lists truck_powers and truck_costs.
+    """
+    with open(filename, "r") as file:
+        nb_trucks = int(file.readline().split()[0])
+        truck_powers = []
+        truck_costs = []
+        for _ in range(nb_trucks):
+            power, cost = map(int, file.readline().split()[:2])
+            truck_powers.append(power)
+            truck_costs.append(cost)
+    return truck_powers, truck_costs
+
+
+class TruckCatalog():
+    """
+    The useful trucks of a catalogue, sorted by power.
+    A truck is dominated when another one has at least its power for at most its cost: it is never worth buying.
+    Once they are removed, the costs increase with the powers, so the cheapest truck with a power >= p
+    is simply the first one with a power >= p, found by bisection in O(log T).
+
+    Attributes:
+    -----------
+    powers, costs: list
+        Powers (increasing) and costs (increasing) of the non dominated trucks.
+    indices: list
+        Position of each of them in the original catalogue (line of trucks.x.in).
+    nb_trucks: int
+        Number of trucks of the original catalogue.
+    """
+
+    def __init__(self, truck_powers, truck_costs):
+        # by decreasing power (and increasing cost for equal powers), a truck is kept if it is cheaper than all the previous ones
+        order = sorted(range(len(truck_powers)), key=lambda j: (-truck_powers[j], truck_costs[j]))
+        kept = []
+        for j in order:
+            if not kept or truck_costs[j] < truck_costs[kept[-1]]:
+                kept.append(j)
+        kept.reverse()
+        self.nb_trucks = len(truck_powers)
+        self.indices = kept
+        self.powers = [truck_powers[j] for j in kept]
+        self.costs = [truck_costs[j] for j in kept]
+        self.powers_array = np.array(self.powers)
+        self.costs_array = np.array(self.costs, dtype=np.int64)
+        self.indices_array = np.array(self.indices, dtype=np.int64)
+        self.catalogue_costs = np.array(truck_costs, dtype=np.int64)
+
+    @classmethod
+    def from_file(cls, filename):
+        """Catalogue of a trucks.x.in file."""
+        return cls(*read_trucks_file(filename))
+
+    def __len__(self):
+        return len(self.powers)
+
+    def cheapest(self, power):
+        """Position (in the catalogue) of the cheapest truck with at least this power, None if there is none."""
+        k = bisect_left(self.powers, power)
+        return self.indices[k] if k < len(self.powers) else None
+
+    def lookup(self, min_powers):
+        """
+        Vectorized version of cheapest for a numpy array of minimal powers:
+        positions in the catalogue, -1 where no truck is powerful enough.
+        """
+        if len(self) == 0:
+            return np.full(np.shape(min_powers), -1, dtype=np.int64)
+        k = np.searchsorted(self.powers_array, min_powers, side="left")
+        return np.where(k < len(self), self.indices_array[np.minimum(k, len(self) - 1)], -1)
+
+
+def route_candidates(min_powers, utilities, catalog):
+    """
+    Dominance pruning: for each route only the cheapest truck covering its minimal power is kept
+    (any other truck costs more for the same utility), and routes with no truck or no profit are dropped.
+
+    Parameters:
+    -----------
+    min_powers: list
+        Minimal power of each route (None if its ends are not connected).
+    utilities: list
+    catalog: TruckCatalog
+
+    Outputs:
+    -----------
+    items: list
+        (route index, truck index, cost, profit) tuples, at most one per route.
+    """
+    if len(catalog) == 0:
+        return []
+    known = np.array([power is not None for power in min_powers], dtype=bool)
+    # no dtype forced: a non integer power (2.5) must not be truncated (to 2) before looking for a truck
+    trucks = catalog.lookup(np.array([0 if power is None else power for power in min_powers]))
+    costs = catalog.catalogue_costs[trucks]
+    profits = np.asarray(utilities, dtype=np.int64) - costs
+    routes = np.flatnonzero(known & (trucks >= 0) & (profits > 0))
+    return list(zip(routes.tolist(), trucks[routes].tolist(), costs[routes].tolist(), profits[routes].tolist()))
+
+
+def sort_by_ratio(items):
+    """Items by decreasing profit/cost ratio (free items first)."""
+    return sorted(items, key=lambda item: item[3] / item[2] if item[2] > 0 else float("inf"), reverse=True)
+
+
+def upper_bound(items, budget):
+    """
+    Dantzig bound: optimum of the fractional problem (items taken by decreasing ratio, the last one partially).
+    No allocation can do better.
+    """
+    bound = 0
+    for _, _, cost, profit in sort_by_ratio(items):
+        if cost <= budget:
+            budget -= cost
+            bound += profit
+        else:
+            return bound + profit * budget / cost
+    return bound
+
+
+def greedy_allocation(items, budget):
+    """
+    Takes the items by decreasing profit/cost ratio as long as they fit (skipping those that do not).
+    The best of this and of the most profitable single item is at least half of the optimum. O(N log N).
+    """
+    chosen = []
+    left = budget
+    total = 0
+    for item in sort_by_ratio(items):
+        if item[2] <= left:
+            chosen.append(item)
+            left -= item[2]
+            total += item[3]
+    fitting = [item for item in items if item[2] <= budget]
+    if fitting:
+        best_single = max(fitting, key=lambda item: item[3])
+        if best_single[3] > total:
+            return [best_single]
+    return chosen
+
+
+def branch_and_bound(items, budget, node_limit=10**6):
+    """
+    Exact 0/1 knapsack by depth first branch and bound on the items sorted by ratio.
+    A node is cut when its Dantzig bound (computed in O(log N) with prefix sums) cannot beat the best allocation.
+    Returns (chosen items, optimal): optimal is False if node_limit was reached before the end of the search,
+    the best allocation found so far (at least the greedy one) is then returned.
+    """
+    items = sort_by_ratio(items)
+    n = len(items)
+    costs = [item[2] for item in items]
+    profits = [item[3] for item in items]
+    prefix_cost = [0]
+    prefix_profit = [0]
+    for cost, profit in zip(costs, profits):
+        prefix_cost.append(prefix_cost[-1] + cost)
+        prefix_profit.append(prefix_profit[-1] + profit)
+
+    def bound(k, left):
+        # items k..j-1 all fit, item j only partially
+        j = bisect_right(prefix_cost, prefix_cost[k] + left, k) - 1
+        value = prefix_profit[j] - prefix_profit[k]
+        if j < n:
+            value += profits[j] * (left - (prefix_cost[j] - prefix_cost[k])) / costs[j]
+        return value, j
+
+    best = greedy_allocation(items, budget)
+    best_value = sum(item[3] for item in best)
+    best_chain = None
+    # a node is (next item, budget left, profit so far, chosen items as a linked list (item index, previous))
+    stack = [(0, budget, 0, None)]
+    nodes = 0
+    optimal = True
+    while stack:
+        nodes += 1
+        if nodes > node_limit:
+            optimal = False
+            break
+        k, left, value, chain = stack.pop()
+        if k == n:
+            continue
+        extra, j = bound(k, left)
+        if value + extra <= best_value:
+            continue
+        if j == n:
+            # everything left fits: this is the best completion of the node
+            for index in range(k, n):
+                chain = (index, chain)
+            best_value, best_chain = value + extra, chain
+            continue
+        stack.append((k + 1, left, value, chain))
+        if costs[k] <= left:
+            stack.append((k + 1, left - costs[k], value + profits[k], (k, chain)))
+            if value + profits[k] > best_value:
+                best_value, best_chain = value + profits[k], (k, chain)
+    if best_chain is not None:
+        best = []
+        while best_chain is not None:
+            index, best_chain = best_chain
+            best.append(items[index])
+        best.reverse()
+    return best, optimal
+
+
+def scaled_dp(items, budget, memory_cap=256 * 2**20):
+    """
+    0/1 knapsack DP where the costs are rounded up to a multiple of a unit, chosen as small as possible
+    so that everything fits in memory_cap bytes. Each budget value costs N bits in the table of choices, plus
+    18 bytes for the DP itself: the best profits (8), the candidate profits (8), the mask of improvements (1)
+    and its packed copy (1/8), all updated in place.
+    Rounding up keeps every allocation found within the true budget. With unit = 1 the result is exact.
+    Returns (chosen items, unit).
+    """
+    n = len(items)
+    if n == 0 or budget <= 0:
+        return [], 1
+    capacity = max(1, min(budget, 8 * memory_cap // (n + 144) - 1))
+    unit = -(-budget // capacity)
+    capacity = budget // unit
+    costs = [-(-item[2] // unit) for item in items]
+    dp = np.zeros(capacity + 1)
+    candidate = np.empty(capacity + 1)
+    take = np.zeros((n, (capacity + 8) // 8), dtype=np.uint8)
+    better = np.zeros(capacity + 1, dtype=bool)
+    for i, (cost, item) in enumerate(zip(costs, items)):
+        if cost > capacity:
+            continue
+        size = capacity + 1 - cost
+        np.add(dp[:size], item[3], out=candidate[:size])
+        better[:cost] = False
+        np.greater(candidate[:size], dp[cost:], out=better[cost:])
+        take[i] = np.packbits(better)
+        # candidate is a separate buffer: dp[:size] was fully read before dp[cost:] is written
+        np.copyto(dp[cost:], candidate[:size], where=better[cost:])
+    chosen = []
+    left = capacity
+    for i in range(n - 1, -1, -1):
+        if (take[i, left >> 3] >> (7 - (left & 7))) & 1:
+            chosen.append(items[i])
+            left -= costs[i]
+    chosen.reverse()
+    return chosen, unit
+
+
+def allocate(items, budget, method="greedy", memory_cap=256 * 2**20, node_limit=10**6):
+    """
+    Solves the allocation with one of the methods above and reports its quality.
+
+    Parameters:
+    -----------
+    items: list
+        (route index, truck index, cost, profit) tuples, see route_candidates.
+    budget: int
+    method: str
+        "greedy", "bnb" or "dp".
+
+    Outputs:
+    -----------
+    result: dict
+        allocation (the chosen items), profit, cost, upper_bound (Dantzig bound),
+        quality (profit / upper_bound) and optimal (True when the allocation is proven optimal).
+    """
+    bound = upper_bound(items, budget)
+    if method == "greedy":
+        chosen = greedy_allocation(items, budget)
+        optimal = False
+    elif method == "bnb":
+        chosen, optimal = branch_and_bound(items, budget, node_limit)
+    elif method == "dp":
+        chosen, unit = scaled_dp(items, budget, memory_cap)
+        optimal = unit == 1
+        # with a coarse unit the greedy allocation may be better
+        greedy = greedy_allocation(items, budget)
+        if sum(item[3] for item in greedy) > sum(item[3] for item in chosen):
+            chosen = greedy
+    else:
+        raise ValueError(f"Unknown method {method}")
+    profit = sum(item[3] for item in chosen)
+    if profit >= bound:
+        optimal = True
+    return {
+        "allocation": chosen,
+        "profit": profit,
+        "cost": sum(item[2] for item in chosen),
+        "upper_bound": bound,
+        "quality": profit / bound if bound > 0 else 1.0,
+        "optimal": optimal,
+    }
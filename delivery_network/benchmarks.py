@@ -0,0 +1,254 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from graph import Graph, Kruskal_LCA, graph_from_file, kruskal, read_network_arrays, read_routes_file
+from csr_graph import CSR_Graph
+
+# Benchmarks of the main steps, to be ran from the root folder:
+#     python delivery_network/benchmarks.py                        every network.x.in file with its routes.x.in file
+#     python delivery_network/benchmarks.py --synthetic path grid --sizes 10000 100000
+#     python delivery_network/benchmarks.py --out new.json --compare old.json
+# For each graph: load time, kruskal time, Kruskal_LCA build time, latency percentiles and throughput of the queries
+# (one by one and with power_batch), and peak memory (tracemalloc, in a separate run since it slows everything down).
+# The results are written as JSON so that two versions can be compared (--compare).
+
+SHAPES = ["random", "path", "grid", "star"]
+
+
+def best_time(function, *args, repeat=3):
+    """Best wall-clock time (in seconds) of function(*args) over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def timed(function, *args):
+    """(result, wall-clock time in seconds) of function(*args)."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(function, *args):
+    """Peak memory (in MB) allocated by python while running function(*args)."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(sorted_values, q):
+    """q-th percentile (0 <= q <= 100) of a sorted list, by nearest rank."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+def synthetic_graph(shape, n, seed=0, max_power=10**6):
+    """
+    Graph of about n nodes (named 1..n) of a given shape, with random powers and distances:
+    random (a random tree plus n random edges), path, grid (side x side) or star.
+    """
+    rng = random.Random(seed)
+    if shape == "grid":
+        side = max(1, int(n ** 0.5))
+        n = side * side
+    g = Graph(range(1, n + 1))
+    if shape == "random":
+        for node in range(2, n + 1):
+            g.add_edge(rng.randint(1, node - 1), node, rng.randint(1, max_power), rng.randint(1, 1000))
+        for _ in range(n):
+            g.add_edge(rng.randint(1, n), rng.randint(1, n), rng.randint(1, max_power), rng.randint(1, 1000))
+    elif shape == "path":
+        for node in range(1, n):
+            g.add_edge(node, node + 1, rng.randint(1, max_power), rng.randint(1, 1000))
+    elif shape == "grid":
+        for node in range(1, n + 1):
+            if node % side:
+                g.add_edge(node, node + 1, rng.randint(1, max_power), rng.randint(1, 1000))
+            if node + side <= n:
+                g.add_edge(node, node + side, rng.randint(1, max_power), rng.randint(1, 1000))
+    elif shape == "star":
+        for node in range(2, n + 1):
+            g.add_edge(1, node, rng.randint(1, max_power), rng.randint(1, 1000))
+    else:
+        raise ValueError(f"Unknown shape {shape}, expected one of {SHAPES}")
+    return g
+
+
+def random_queries(g, nb_queries, seed=0):
+    """nb_queries random (src, dest) pairs of nodes of g."""
+    rng = random.Random(seed)
+    nodes = list(g.graph)
+    return [(rng.choice(nodes), rng.choice(nodes)) for _ in range(nb_queries)]
+
+
+def benchmark_graph(name, load, queries, memory=True):
+    """
+    Runs every step on the graph returned by load() and on the (src, dest) queries.
+    Returns a dictionary of measures (times in seconds, latencies in microseconds, memory in MB).
+    """
+    g, load_time = timed(load)
+    _, kruskal_time = timed(kruskal, g)
+    engine, lca_time = timed(Kruskal_LCA, g)
+    latencies = []
+    power = engine.power
+    for src, dest in queries:
+        start = time.perf_counter()
+        power(src, dest)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    src = np.array([src for src, _ in queries])
+    dest = np.array([dest for _, dest in queries])
+    engine.numpy_tables()
+    _, batch_time = timed(engine.power_batch, src, dest)
+    result = {
+        "name": name,
+        "nb_nodes": g.nb_nodes,
+        "nb_edges": g.nb_edges,
+        "nb_queries": len(queries),
+        "load_s": load_time,
+        "kruskal_s": kruskal_time,
+        "lca_build_s": lca_time,
+        "query_p50_us": percentile(latencies, 50) * 1e6 if latencies else None,
+        "query_p90_us": percentile(latencies, 90) * 1e6 if latencies else None,
+        "query_p99_us": percentile(latencies, 99) * 1e6 if latencies else None,
+        "query_max_us": latencies[-1] * 1e6 if latencies else None,
+        "queries_per_s": len(queries) / total if total > 0 else None,
+        "batch_queries_per_s": len(queries) / batch_time if batch_time > 0 else None,
+    }
+    if memory:
+        result["load_peak_MB"] = peak_memory(load)
+        result["lca_build_peak_MB"] = peak_memory(Kruskal_LCA, g)
+    return result
+
+
+def benchmark_files(network_files, max_queries=None, memory=True):
+    """Benchmarks each network.x.in file with the queries of its routes.x.in file (random queries if there is none)."""
+    results = []
+    for filename in network_files:
+        routes_file = os.path.join(os.path.dirname(filename), os.path.basename(filename).replace("network", "routes"))
+        if os.path.exists(routes_file):
+            queries = [(src, dest) for src, dest, _ in read_routes_file(routes_file)]
+        else:
+            queries = random_queries(graph_from_file(filename), max_queries or 1000)
+        if max_queries is not None:
+            queries = queries[:max_queries]
+        results.append(benchmark_graph(os.path.basename(filename), lambda: graph_from_file(filename), queries, memory))
+    return results
+
+
+def benchmark_synthetic(shapes, sizes, nb_queries=10000, seed=0, memory=True):
+    """Benchmarks synthetic graphs of every shape and size (the load time is the time to build the graph)."""
+    results = []
+    for shape in shapes:
+        for n in sizes:
+            queries = random_queries(synthetic_graph(shape, n, seed), nb_queries, seed)
+            results.append(benchmark_graph(f"{shape}-{n}", lambda: synthetic_graph(shape, n, seed), queries, memory))
+    return results
+
+
+def benchmark_loading(files, repeat=3):
+    """
+    Times the loading of each network file: parsing only (read_network_arrays),
+    Graph (graph_from_file) and CSR_Graph (CSR_Graph.from_file).
+    Returns a list of dictionaries, one per file.
+    """
+    results = []
+    for filename in files:
+        results.append({
+            "file": os.path.basename(filename),
+            "size_MB": os.path.getsize(filename) / 1e6,
+            "parse_s": best_time(read_network_arrays, filename, repeat=repeat),
+            "graph_s": best_time(graph_from_file, filename, repeat=repeat),
+            "csr_s": best_time(CSR_Graph.from_file, filename, repeat=repeat),
+        })
+    return results
+
+
+def environment():
+    """Where the results come from: version of the code, python and machine."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def compare(old, new):
+    """
+    Prints, for each graph and measure present in both result files, the ratio new / old
+    (above 1 is slower or bigger for times and memory, faster for the *_per_s measures).
+    """
+    old_results = {result["name"]: result for result in old["results"]}
+    for result in new["results"]:
+        before = old_results.get(result["name"])
+        if before is None:
+            continue
+        print(result["name"])
+        for key, value in result.items():
+            if isinstance(value, (int, float)) and isinstance(before.get(key), (int, float)) and before[key]:
+                print(f"    {key:>20}: {before[key]:>14.4f} -> {value:>14.4f}  (x{value / before[key]:.2f})")
+
+
+def print_table(results):
+    """Prints a list of dictionaries with the same keys as a table."""
+    if not results:
+        return
+    keys = list(results[0])
+    print("  ".join(f"{key:>14}" for key in keys))
+    for result in results:
+        print("  ".join(f"{value:>14.4f}" if isinstance(value, float) else f"{str(value):>14}" for value in result.values()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of graph loading, kruskal and min power queries")
+    parser.add_argument("--networks", nargs="*", default=None,
+                        help="network files (default: every input/network.x.in file)")
+    parser.add_argument("--synthetic", nargs="*", default=[], choices=SHAPES, help="shapes of synthetic graphs")
+    parser.add_argument("--sizes", nargs="*", type=int, default=[10000, 100000], help="sizes of the synthetic graphs")
+    parser.add_argument("--queries", type=int, default=None, help="maximal number of queries per graph")
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slow) peak memory measures")
+    parser.add_argument("--loading", action="store_true", help="only compare the loaders")
+    parser.add_argument("--out", default=None, help="JSON file for the results")
+    parser.add_argument("--compare", default=None, help="JSON file of previous results to compare with")
+    args = parser.parse_args(argv)
+    networks = args.networks if args.networks is not None else sorted(glob.glob("input/network.*.in"))
+    if args.loading:
+        print_table(benchmark_loading(networks))
+        return
+    results = benchmark_files(networks, args.queries, not args.no_memory)
+    results += benchmark_synthetic(args.synthetic, args.sizes, args.queries or 10000, memory=not args.no_memory)
+    report = {"environment": environment(), "results": results}
+    print_table(results)
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump(report, out, indent=2)
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(json.load(previous), report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
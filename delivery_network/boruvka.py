@@ -0,0 +1,81 @@
+import numpy as np
+
+from graph import Graph, read_network_arrays
+
+# MST engine without a python loop over the edges: Borůvka's algorithm on numpy arrays.
+# Each round, every component picks its lightest outgoing edge (np.minimum.at over the two ends of the edges),
+# the picked edges are added to the MST and the components they link are contracted by pointer jumping;
+# the edges inside a component are then dropped in bulk, as filter-Kruskal does.
+# The number of components is at least halved at each round, so there are O(log(V)) rounds of O(E) numpy work.
+# The edges are sorted by power once, so that ties are broken by position: no cycle can be created
+# and the MST has the same total power as the one of kruskal().
+
+
+def boruvka_arrays(n, sources, targets, powers):
+    """
+    Minimum spanning forest of the graph on the nodes 0..n-1 whose edges are (sources[k], targets[k], powers[k]).
+    Returns the sorted array of the positions k of the edges of the forest.
+    """
+    order = np.argsort(np.asarray(powers), kind="stable")
+    u = np.asarray(sources, dtype=np.int64)[order]
+    v = np.asarray(targets, dtype=np.int64)[order]
+    # edge e of the rounds below is the edge order[e] of the input, e is its rank by power
+    edges = np.arange(len(order), dtype=np.int64)
+    component = np.arange(n, dtype=np.int64)
+    chosen = []
+    none = len(order)
+    while True:
+        cu = component[u]
+        cv = component[v]
+        outgoing = cu != cv
+        u, v, edges, cu, cv = u[outgoing], v[outgoing], edges[outgoing], cu[outgoing], cv[outgoing]
+        if len(edges) == 0:
+            break
+        # lightest outgoing edge of each component
+        best = np.full(n, none, dtype=np.int64)
+        np.minimum.at(best, cu, edges)
+        np.minimum.at(best, cv, edges)
+        roots = np.flatnonzero(best < none)
+        picked = best[roots]
+        chosen.append(np.unique(picked))
+        # each component points to the component at the other end of its edge, two components that picked
+        # the same edge point to each other: the smaller one becomes the root of the merged component
+        position = np.searchsorted(edges, picked)
+        other = np.where(cu[position] == roots, cv[position], cu[position])
+        pointer = np.arange(n, dtype=np.int64)
+        pointer[roots] = other
+        mutual = pointer[other] == roots
+        pointer[roots[mutual & (roots < other)]] = roots[mutual & (roots < other)]
+        while True:
+            jumped = pointer[pointer]
+            if np.array_equal(jumped, pointer):
+                break
+            pointer = jumped
+        component = pointer[component]
+    if not chosen:
+        return np.empty(0, dtype=np.int64)
+    return np.sort(order[np.concatenate(chosen)])
+
+
+def boruvka(input_graph):
+    """Same output as kruskal(input_graph) (a Graph of the MST edges, same total power), computed by boruvka_arrays."""
+    nodes = list(input_graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = input_graph.list_of_edges
+    sources = np.fromiter((index[n1] for n1, _, _ in edges), dtype=np.int64, count=len(edges))
+    targets = np.fromiter((index[n2] for _, n2, _ in edges), dtype=np.int64, count=len(edges))
+    powers = np.array([power for _, _, power in edges])
+    MST = Graph()
+    for k in boruvka_arrays(len(nodes), sources, targets, powers).tolist():
+        MST.add_edge(*edges[k])
+    return MST
+
+
+def boruvka_from_file(filename):
+    """
+    MST of a network.x.in file without building the Graph: (n, (k, 4) array of the edges 'node1 node2 power_min dist'),
+    graph_from_arrays(n, mst) gives it as a Graph.
+    """
+    n, edges = read_network_arrays(filename)
+    kept = boruvka_arrays(n + 1, edges[:, 0], edges[:, 1], edges[:, 2])
+    return n, edges[kept]
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from graph import Graph, Kruskal_LCA, graph_from_arrays, power_array, read_network_arrays
+
+# Binary cache of the parsed network files (and of their MST / LCA tables).
+# Each network.x.in file gets a folder of .npy files in <folder of the file>/.cache/,
+# whose name depends on the path, modification time and size of the file and on CACHE_VERSION:
+# editing the file (or changing the format below) simply leads to a new folder.
+# The arrays are opened with mmap, so that loading does not parse anything.
+
+CACHE_VERSION = 1
+
+
+def cache_folder(filename, cache_dir=None):
+    """Folder of the cache entry of a network file (it may not exist yet)."""
+    stat = os.stat(filename)
+    key = f"{os.path.abspath(filename)}|{stat.st_mtime_ns}|{stat.st_size}|{CACHE_VERSION}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(filename)), ".cache")
+    return os.path.join(cache_dir, f"{os.path.basename(filename)}.{digest}")
+
+
+def save_arrays(folder, arrays):
+    """
+    Writes a dictionary of numpy arrays as name.npy files in folder.
+    The files are written in a temporary folder first, then moved, so that a cache entry is never half written.
+    """
+    os.makedirs(folder, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=folder)
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp, name + ".npy"), values)
+    for name in arrays:
+        os.replace(os.path.join(tmp, name + ".npy"), os.path.join(folder, name + ".npy"))
+    shutil.rmtree(tmp)
+
+
+def load_arrays(folder, names):
+    """Opens the arrays names from folder with mmap, returns None if one of them is missing."""
+    try:
+        return [np.load(os.path.join(folder, name + ".npy"), mmap_mode="r") for name in names]
+    except FileNotFoundError:
+        return None
+
+
+def cached_network_arrays(filename, cache_dir=None):
+    """Same as read_network_arrays, the file is only parsed the first time."""
+    folder = cache_folder(filename, cache_dir)
+    arrays = load_arrays(folder, ["nb_nodes", "edges"])
+    if arrays is not None:
+        return int(arrays[0][0]), arrays[1]
+    n, edges = read_network_arrays(filename)
+    save_arrays(folder, {"nb_nodes": np.array([n]), "edges": edges})
+    return n, edges
+
+
+def cached_graph_from_file(filename, cache_dir=None):
+    """Same as graph_from_file, the file is only parsed the first time."""
+    n, edges = cached_network_arrays(filename, cache_dir)
+    return graph_from_arrays(n, np.asarray(edges))
+
+
+def cached_kruskal_LCA(filename, cache_dir=None):
+    """
+    Kruskal_LCA engine of a network file. The first time the graph is loaded and the tables are computed
+    (kruskal then binary lifting) and saved, later calls only read the tables.
+    """
+    folder = cache_folder(filename, cache_dir)
+    names = ["lca_labels", "lca_depth", "lca_component", "lca_up", "lca_max_up"]
+    arrays = load_arrays(folder, names)
+    if arrays is not None:
+        labels, depth, component, up, max_up = (values.tolist() for values in arrays)
+        return Kruskal_LCA.from_tables(labels, depth, component, up, max_up)
+    engine = Kruskal_LCA(cached_graph_from_file(filename, cache_dir))
+    save_arrays(folder, {
+        "lca_labels": np.array(engine.labels, dtype=np.int64),
+        "lca_depth": np.array(engine.depth, dtype=np.int64),
+        "lca_component": np.array(engine.component, dtype=np.int64),
+        "lca_up": np.array(engine.up, dtype=np.int64),
+        "lca_max_up": power_array(engine.max_up),
+    })
+    return engine
+
+
+def cached_kruskal(filename, cache_dir=None):
+    """MST of a network file (as kruskal would return it, up to the order of the edges), rebuilt from the cache."""
+    MST = Graph()
+    for node1, node2, power in cached_kruskal_LCA(filename, cache_dir).mst_edges():
+        MST.add_edge(node1, node2, power)
+    return MST
+
+
+def clear_cache(filename, cache_dir=None):
+    """Removes the cache entry of a network file (if any)."""
+    shutil.rmtree(cache_folder(filename, cache_dir), ignore_errors=True)
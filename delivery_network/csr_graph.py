@@ -0,0 +1,171 @@
+from array import array
+
+import numpy as np
+
+from graph import read_network_arrays
+
+
+def compact_array(values):
+    """Array of integers using 4 bytes per value when they fit, 8 bytes otherwise."""
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0 or (values.max() < 2**31 and values.min() >= -2**31):
+        return array("i", values.astype(np.int32).tobytes())
+    return array("q", values.tobytes())
+
+
+class CSR_Graph():
+    """
+    A frozen (read-only) graph stored in compressed sparse row (CSR) form.
+    Nodes are numbered 0..n-1 and the edges leaving node i are the positions offsets[i]..offsets[i+1]-1 of
+    neighbors, powers and dists. Each non oriented edge is stored twice (once per end), as in Graph.graph.
+    This takes a few bytes per edge instead of the tuples and lists of Graph, and traversals read contiguous arrays.
+
+    Attributes:
+    -----------
+    nb_nodes: int
+    nb_edges: int
+    offsets: array
+        n+1 positions in the arrays below.
+    neighbors: array
+        The other end (node number) of each half edge.
+    powers: array
+        The minimal power of each half edge.
+    dists: array
+        The distance of each half edge.
+    labels: list or None
+        labels[i] is the name of node i in the original graph. None means that node i is named i+1,
+        as in the network.x.in files, so that no dictionary is needed.
+    """
+
+    def __init__(self, nb_nodes, sources, targets, powers, dists, labels=None):
+        """
+        Builds the CSR arrays from the list of edges (lists or numpy arrays) in a few vectorized steps.
+        sources and targets are node numbers in 0..nb_nodes-1.
+        """
+        self.nb_nodes = nb_nodes
+        self.nb_edges = len(sources)
+        self.labels = labels
+        self.index_of = None if labels is None else {node: i for i, node in enumerate(labels)}
+        # half edge 2k goes from sources[k] to targets[k] and half edge 2k+1 goes back:
+        # a stable sort by origin keeps, for each node, the order of the edges
+        origins = np.empty(2*self.nb_edges, dtype=np.int64)
+        origins[0::2] = sources
+        origins[1::2] = targets
+        ends = np.empty(2*self.nb_edges, dtype=np.int64)
+        ends[0::2] = targets
+        ends[1::2] = sources
+        order = np.argsort(origins, kind="stable")
+        offsets = np.zeros(nb_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origins, minlength=nb_nodes), out=offsets[1:])
+        self.offsets = compact_array(offsets)
+        self.neighbors = compact_array(ends[order])
+        self.powers = compact_array(np.repeat(np.asarray(powers, dtype=np.int64), 2)[order])
+        self.dists = compact_array(np.repeat(np.asarray(dists, dtype=np.int64), 2)[order])
+
+    @classmethod
+    def from_graph(cls, g):
+        """Frozen CSR copy of a Graph."""
+        labels = list(g.graph)
+        index = {node: i for i, node in enumerate(labels)}
+        sources, targets, powers, dists = [], [], [], []
+        for node, adjacency in g.graph.items():
+            i = index[node]
+            loop = False
+            for neighbor, power, dist in adjacency:
+                j = index[neighbor]
+                # each edge appears in the adjacency of both ends (twice for a loop): we keep it once
+                if i == j:
+                    loop = not loop
+                    if not loop:
+                        continue
+                elif i > j:
+                    continue
+                sources.append(i)
+                targets.append(j)
+                powers.append(power)
+                dists.append(dist)
+        if labels == list(range(1, len(labels) + 1)):
+            labels = None
+        return cls(len(index), sources, targets, powers, dists, labels)
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        Reads a network.x.in file (same format as graph_from_file) directly into a CSR_Graph,
+        without building the Graph first.
+        """
+        n, edges = read_network_arrays(filename)
+        return cls(n, edges[:, 0] - 1, edges[:, 1] - 1, edges[:, 2], edges[:, 3])
+
+    def index(self, node):
+        """Node number of a label."""
+        if self.labels is None:
+            return node - 1
+        return self.index_of[node]
+
+    def label(self, i):
+        """Label of a node number."""
+        if self.labels is None:
+            return i + 1
+        return self.labels[i]
+
+    def memory_usage(self):
+        """Number of bytes used by the CSR arrays."""
+        return sum(a.itemsize*len(a) for a in (self.offsets, self.neighbors, self.powers, self.dists))
+
+    def bfs(self, beg, dest=None, power=None):
+        """
+        Breadth first search from node number beg, using only the edges with a power <= power (all if None).
+        Stops as soon as dest (a node number) is reached.
+        Returns the array of parents: parent[i] is the node from which i was reached, -1 if i was not reached.
+        """
+        offsets, neighbors, powers = self.offsets, self.neighbors, self.powers
+        parent = array("i", [-1])*self.nb_nodes
+        parent[beg] = beg
+        if beg == dest:
+            return parent
+        queue = [beg]
+        for i in queue:
+            for k in range(offsets[i], offsets[i + 1]):
+                j = neighbors[k]
+                if parent[j] == -1 and (power is None or powers[k] <= power):
+                    parent[j] = i
+                    if j == dest:
+                        return parent
+                    queue.append(j)
+        return parent
+
+    def get_path_with_power(self, src, dest, power):
+        """Same as Graph.get_path_with_power: a path (list of labels) from src to dest with this power, or None."""
+        i = self.index(src)
+        j = self.index(dest)
+        parent = self.bfs(i, j, power)
+        if parent[j] == -1:
+            return None
+        path = [j]
+        while j != i:
+            j = parent[j]
+            path.append(j)
+        return [self.label(k) for k in reversed(path)]
+
+    def connected_components(self):
+        """Same as Graph.connected_components: the list of the connected components (lists of labels)."""
+        offsets, neighbors = self.offsets, self.neighbors
+        seen = bytearray(self.nb_nodes)
+        components = []
+        for root in range(self.nb_nodes):
+            if seen[root]:
+                continue
+            seen[root] = 1
+            queue = [root]
+            for i in queue:
+                for k in range(offsets[i], offsets[i + 1]):
+                    j = neighbors[k]
+                    if not seen[j]:
+                        seen[j] = 1
+                        queue.append(j)
+            components.append([self.label(i) for i in queue])
+        return components
+
+    def connected_components_set(self):
+        return set(map(frozenset, self.connected_components()))
@@ -0,0 +1,185 @@
+import argparse
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+from itertools import islice
+from operator import itemgetter
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Kruskal for network files too large to be loaded (as a Graph, or even as one array of edges).
+# The file is read by chunks of chunk_size edges; each chunk is sorted by power (and optionally filtered)
+# and written to disk as a sorted run (.npy). The runs are then merged with heapq.merge, reading each one
+# by small blocks through mmap, and the merged stream of edges feeds an array union-find on the nodes 1..n.
+# The memory used is one chunk, plus the union-find and the MST (O(n)), whatever the number of edges.
+# The chunks can be sorted by a pool of processes (workers). With filter_chunks, each chunk is reduced to its own
+# minimum spanning forest before being written: by the cycle property an edge that closes a cycle of lighter edges
+# of its chunk is in no MST, so the runs hold at most n-1 edges each.
+#     python delivery_network/external_kruskal.py input/network.big.in --chunk-size 1000000 --workers 4
+
+
+def read_network_header(filename):
+    """(n, m) from the first line of a network.x.in file."""
+    with open(filename, "rb") as file:
+        n, m = map(int, file.readline().split()[:2])
+    return n, m
+
+
+def iter_network_chunks(filename, chunk_size=10**6):
+    """
+    Generator of the edges of a network.x.in file by (k, 4) arrays 'node1 node2 power_min dist' of at most
+    chunk_size rows (dist is 1 when missing), so that only one chunk is in memory at a time.
+    """
+    with open(filename, "rb") as file:
+        m = int(file.readline().split()[1])
+        while m > 0:
+            lines = [line for line in islice(file, min(chunk_size, m)) if line.strip()]
+            if not lines:
+                break
+            m -= len(lines)
+            values = b" ".join(lines).split()
+            edges = np.ones((len(lines), 4), dtype=np.int64)
+            if len(values) == 4*len(lines):
+                edges[:, :] = np.array(values, dtype=np.int64).reshape(-1, 4)
+            elif len(values) == 3*len(lines):
+                edges[:, :3] = np.array(values, dtype=np.int64).reshape(-1, 3)
+            else:
+                for k, line in enumerate(lines):
+                    edge = line.split()
+                    if len(edge) not in (3, 4):
+                        raise Exception("Format incorrect")
+                    edges[k, :len(edge)] = list(map(int, edge))
+            yield edges
+
+
+def spanning_forest(edges, n):
+    """Rows of edges (sorted by power) kept by Kruskal on the nodes 1..n: the minimum spanning forest of the chunk."""
+    parent = array("i", range(n + 1))
+    kept = []
+    for k, (n1, n2) in enumerate(edges[:, :2].tolist()):
+        while parent[n1] != n1:
+            parent[n1] = parent[parent[n1]]
+            n1 = parent[n1]
+        while parent[n2] != n2:
+            parent[n2] = parent[parent[n2]]
+            n2 = parent[n2]
+        if n1 != n2:
+            parent[n2] = n1
+            kept.append(k)
+    return edges[kept]
+
+
+def sorted_run(edges, path, n=None):
+    """
+    Sorts a chunk of edges by power (dropping the loops), reduces it to its spanning forest if n is given,
+    and writes it to path (.npy). Returns (path, number of edges written).
+    """
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    edges = edges[np.argsort(edges[:, 2], kind="stable")]
+    if n is not None:
+        edges = spanning_forest(edges, n)
+    np.save(path, edges)
+    return path, len(edges)
+
+
+def iter_run(path, block_size=4096):
+    """Generator of the rows (lists) of a sorted run, read by blocks of block_size rows through mmap."""
+    run = np.load(path, mmap_mode="r")
+    for start in range(0, len(run), block_size):
+        yield from run[start:start + block_size].tolist()
+    del run
+
+
+def external_kruskal(filename, chunk_size=10**6, workers=0, filter_chunks=False, folder=None):
+    """
+    Minimum spanning forest of the network file filename, built with bounded memory (see above).
+    The file is only read: nothing is modified.
+
+    Parameters:
+    -----------
+    filename: str
+    chunk_size: int
+        Number of edges sorted at a time.
+    workers: int
+        Number of processes sorting the chunks (0: everything in this process).
+    filter_chunks: bool
+        Reduce each chunk to its spanning forest before writing it (smaller runs, more work per chunk).
+    folder: str, optional
+        Where the temporary runs are written (default: the temporary folder of the system).
+
+    Outputs:
+    -----------
+    n: int
+        The number of nodes.
+    mst: numpy.ndarray
+        (k, 4) array of the edges 'node1 node2 power_min dist' of the forest by increasing power
+        (graph_from_arrays(n, mst) gives it as a Graph).
+    """
+    n, _ = read_network_header(filename)
+    limit = n if filter_chunks else None
+    with tempfile.TemporaryDirectory(dir=folder) as tmp:
+        runs = []
+        chunks = iter_network_chunks(filename, chunk_size)
+        if workers:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for k, edges in enumerate(chunks):
+                    pending.append(pool.submit(sorted_run, edges, os.path.join(tmp, f"run{k}.npy"), limit))
+                    # at most 2 chunks per worker are waiting, so that the memory stays bounded
+                    if len(pending) >= 2 * workers:
+                        runs.append(pending.popleft().result())
+                while pending:
+                    runs.append(pending.popleft().result())
+        else:
+            for k, edges in enumerate(chunks):
+                runs.append(sorted_run(edges, os.path.join(tmp, f"run{k}.npy"), limit))
+        merged = heapq.merge(*(iter_run(path) for path, size in runs if size), key=itemgetter(2))
+        # union-find with path halving and union by size on the nodes 1..n
+        parent = array("i", range(n + 1))
+        size = array("i", [1])*(n + 1)
+        mst = array("q")
+        nb_edges = 0
+        for edge in merged:
+            i, j = edge[0], edge[1]
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            while parent[j] != j:
+                parent[j] = parent[parent[j]]
+                j = parent[j]
+            if i == j:
+                continue
+            if size[i] < size[j]:
+                i, j = j, i
+            parent[j] = i
+            size[i] += size[j]
+            mst.extend(edge)
+            nb_edges += 1
+            if nb_edges == n - 1:
+                break
+        del merged
+    return n, np.frombuffer(mst, dtype=np.int64).reshape(-1, 4).copy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kruskal with bounded memory on a network.x.in file")
+    parser.add_argument("filename")
+    parser.add_argument("--chunk-size", type=int, default=10**6)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--filter", action="store_true", help="reduce each chunk to its spanning forest")
+    parser.add_argument("--out", default=None, help="file for the MST (network.x.in format)")
+    args = parser.parse_args(argv)
+    n, mst = external_kruskal(args.filename, args.chunk_size, args.workers, args.filter)
+    print(f"{len(mst)} edges, total power {int(mst[:, 2].sum())}")
+    if args.out:
+        with open(args.out, "w") as out:
+            out.write(f"{n} {len(mst)}\n")
+            np.savetxt(out, mst, fmt="%d")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,150 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+# Generator of large synthetic networks and routes, to test the scaling limits of the loaders, kruskal and the queries.
+# The files have the format of network.x.in / routes.x.in (see README.md). The edges are drawn and written by chunks:
+# the memory used depends on chunk_size only, not on the size of the graph. Same seed, same files.
+#     python delivery_network/generator.py network input/network.big.in --nodes 1000000 --edges 3000000 --binary
+#     python delivery_network/generator.py routes input/routes.big.in --nodes 1000000 --routes 1000000
+
+POWER_DISTRIBUTIONS = ["uniform", "exponential", "lognormal", "levels"]
+
+
+def draw_powers(rng, size, distribution="uniform", max_power=10**6, levels=100):
+    """
+    size random powers between 1 and max_power:
+    uniform, exponential (many small powers), lognormal (a bump and a long tail)
+    or levels (only a few distinct values, which makes min_power searches short).
+    """
+    if distribution == "uniform":
+        powers = rng.integers(1, max_power, size, endpoint=True)
+    elif distribution == "exponential":
+        powers = 1 + rng.exponential(max_power / 10, size)
+    elif distribution == "lognormal":
+        powers = rng.lognormal(np.log(max_power / 10), 1.0, size)
+    elif distribution == "levels":
+        powers = rng.integers(1, levels, size, endpoint=True) * max(1, max_power // levels)
+    else:
+        raise ValueError(f"Unknown distribution {distribution}, expected one of {POWER_DISTRIBUTIONS}")
+    return np.clip(powers, 1, max_power).astype(np.int64)
+
+
+def draw_nodes(rng, size, high, skew=0.0):
+    """
+    size random nodes among 1..high (high may be an array). With skew > 0 the small node numbers are drawn more often
+    (u**(1+skew) is concentrated near 0), which gives hubs and a skewed degree distribution.
+    """
+    return 1 + np.minimum((high * rng.random(size) ** (1 + skew)).astype(np.int64), np.asarray(high) - 1)
+
+
+def generate_edges(n, m, power="uniform", max_power=10**6, connected=True, skew=0.0, max_dist=10**4, seed=0,
+                   chunk_size=10**6):
+    """
+    Generator of the m edges of a random graph on the nodes 1..n, by (k, 4) arrays 'node1 node2 power dist'.
+    If connected, the n-1 first edges form a random tree (node v is linked to a node drawn among 1..v-1),
+    so that the graph has a single connected component; the other edges link two random nodes.
+    """
+    if connected and m < n - 1:
+        raise ValueError("A connected graph on n nodes needs at least n-1 edges")
+    rng = np.random.default_rng(seed)
+    nb_tree = n - 1 if connected else 0
+    for start in range(0, m, chunk_size):
+        stop = min(m, start + chunk_size)
+        edges = np.empty((stop - start, 4), dtype=np.int64)
+        # tree edges are the positions start..nb_tree-1 of this chunk, random edges the rest
+        tree = max(0, min(stop, nb_tree) - start)
+        if tree:
+            children = np.arange(start + 2, start + 2 + tree, dtype=np.int64)
+            edges[:tree, 0] = draw_nodes(rng, tree, children - 1, skew)
+            edges[:tree, 1] = children
+        if tree < len(edges):
+            edges[tree:, 0] = draw_nodes(rng, len(edges) - tree, n, skew)
+            edges[tree:, 1] = draw_nodes(rng, len(edges) - tree, n, skew)
+        edges[:, 2] = draw_powers(rng, len(edges), power, max_power)
+        edges[:, 3] = rng.integers(1, max_dist, len(edges), endpoint=True)
+        yield edges
+
+
+def generate_network(filename, n, m, binary=None, with_dist=True, **options):
+    """
+    Writes a random network of n nodes and m edges in filename (network.x.in format),
+    and, if binary is given, in this folder as nb_nodes.npy and edges.npy (same layout as the cache entries
+    of cache.py, see load_binary_network). options are passed to generate_edges.
+    """
+    edges_file = None
+    if binary is not None:
+        os.makedirs(binary, exist_ok=True)
+        np.save(os.path.join(binary, "nb_nodes.npy"), np.array([n]))
+        edges_file = np.lib.format.open_memmap(os.path.join(binary, "edges.npy"), mode="w+", dtype=np.int64,
+                                               shape=(m, 4))
+    columns = 4 if with_dist else 3
+    with open(filename, "w", buffering=2**20) as out:
+        out.write(f"{n} {m}\n")
+        position = 0
+        for edges in generate_edges(n, m, **options):
+            if edges_file is not None:
+                edges_file[position:position + len(edges)] = edges
+                if not with_dist:
+                    edges_file[position:position + len(edges), 3] = 1
+            position += len(edges)
+            np.savetxt(out, edges[:, :columns], fmt="%d")
+    if edges_file is not None:
+        edges_file.flush()
+        del edges_file
+
+
+def load_binary_network(folder):
+    """(n, edges) of a binary network written by generate_network, opened with mmap (see graph_from_arrays)."""
+    n = int(np.load(os.path.join(folder, "nb_nodes.npy"))[0])
+    return n, np.load(os.path.join(folder, "edges.npy"), mmap_mode="r")
+
+
+def generate_routes(filename, n, nb_routes, max_utility=10**4, skew=0.0, seed=0, chunk_size=10**6):
+    """Writes nb_routes random routes 'src dest utility' between the nodes 1..n in filename (routes.x.in format)."""
+    rng = np.random.default_rng(seed)
+    with open(filename, "w", buffering=2**20) as out:
+        out.write(f"{nb_routes}\n")
+        for start in range(0, nb_routes, chunk_size):
+            size = min(chunk_size, nb_routes - start)
+            routes = np.empty((size, 3), dtype=np.int64)
+            routes[:, 0] = draw_nodes(rng, size, n, skew)
+            routes[:, 1] = draw_nodes(rng, size, n, skew)
+            routes[:, 2] = rng.integers(1, max_utility, size, endpoint=True)
+            np.savetxt(out, routes, fmt="%d")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator of large random networks and routes files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    network = commands.add_parser("network", help="write a network.x.in file")
+    network.add_argument("filename")
+    network.add_argument("--nodes", type=int, required=True)
+    network.add_argument("--edges", type=int, required=True)
+    network.add_argument("--power", choices=POWER_DISTRIBUTIONS, default="uniform")
+    network.add_argument("--max-power", type=int, default=10**6)
+    network.add_argument("--disconnected", action="store_true", help="no spanning tree: only random edges")
+    network.add_argument("--skew", type=float, default=0.0, help="degree skew (0: uniform endpoints)")
+    network.add_argument("--no-dist", action="store_true", help="write 3 columns only")
+    network.add_argument("--binary", default=None, help="folder for the binary copy (nb_nodes.npy, edges.npy)")
+    network.add_argument("--seed", type=int, default=0)
+    routes = commands.add_parser("routes", help="write a routes.x.in file")
+    routes.add_argument("filename")
+    routes.add_argument("--nodes", type=int, required=True)
+    routes.add_argument("--routes", type=int, required=True)
+    routes.add_argument("--max-utility", type=int, default=10**4)
+    routes.add_argument("--skew", type=float, default=0.0)
+    routes.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.command == "network":
+        generate_network(args.filename, args.nodes, args.edges, binary=args.binary, with_dist=not args.no_dist,
+                         power=args.power, max_power=args.max_power, connected=not args.disconnected,
+                         skew=args.skew, seed=args.seed)
+    else:
+        generate_routes(args.filename, args.nodes, args.routes, args.max_utility, args.skew, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,3 +1,14 @@
+from array import array
+from collections import OrderedDict
+import heapq
+from itertools import islice
+import os
+
+import numpy as np
+
+from allocation import TruckCatalog, allocate, read_trucks_file, route_candidates
+
+
 class Graph:
     """
     A class representing graphs as adjacency lists and implementing various algorithms on the graphs. Graphs in the class are not oriented. 
@@ -24,13 +35,19 @@ class Graph:
         nodes: list, optional
             A list of nodes. Default is empty.
         """
-        self.nodes = nodes
+        self.nodes = list(nodes)
         self.graph = dict([(n, []) for n in nodes])
         self.nb_nodes = len(nodes)
         self.nb_edges = 0
         self.list_of_neighbours = []
         self.list_of_edges = []
         self.max_power = 0
+        self.lca_engine = None
+        self.component_id = None
+        self.sorted_powers = None
+        self.dynamic_mst = None
+        self.query_cache = None
+        self.power_index = None
     
 
     def __str__(self):
@@ -71,6 +88,18 @@ class Graph:
         self.graph[node2].append((node1, power_min, dist))
         self.nb_edges += 1
         self.list_of_edges.append((node1,node2,power_min))
+        if power_min > self.max_power:
+            self.max_power = power_min
+        # the MST (and thus the LCA tables), the components and the set of powers may change with the new edge
+        self.lca_engine = None
+        self.component_id = None
+        self.sorted_powers = None
+        self.power_index = None
+        # except for the incremental MST, which is updated instead of being rebuilt
+        if self.dynamic_mst is not None:
+            self.dynamic_mst.add_edge(node1, node2, power_min)
+        if self.query_cache is not None:
+            self.query_cache.clear()
     
 
 
@@ -133,39 +162,67 @@ class Graph:
         # la liste ancêtre et une liste parcours qui ont toutes les deux une longueur maximale V.
 
 
-    def dfs(self, node, visites, composantes, power=1000000000):  
+    def dfs(self, node, visites=None, composantes=None, power=None):  
     #on a rajouté une condition de puissance afin de pouvoir conditionner les chemins possible dans la question 
-    #traitant de la puissance minimale à avoir pour un trajet. On met une valeur très importante par défaut pour 
-    #éviter qu'il n'ampute des trajectoires possibles sur des graphes
-        visites.append(node) 
-    #on prend un point à partir duquel on veut commencer notre dfs et on l'ajoute à la liste 
-    #visites qui conservera tous les noeuds déjà visités
+    #traitant de la puissance minimale à avoir pour un trajet. Par défaut (None) il n'y a aucune condition :
+    #une valeur "très importante" amputerait les arêtes de puissance supérieure (les puissances ne sont pas bornées)
+    #visites est un set (test d'appartenance en O(1)) qui conserve tous les noeuds déjà visités,
+    #et la composante trouvée est ajoutée à la liste composantes.
+    #Le parcours est itératif avec une pile explicite : pas de limite de récursion sur les longs chemins.
+        if visites is None:
+            visites = set()
+        if composantes is None:
+            composantes = []
+        visites.add(node)
         composantes.append(node)
-    #la liste composantes n'est ici pas indispensable mais sera utile pour la question qui suit 
-        for i in self.graph[node]: 
-            if i[0] not in visites and power >= i[1]: 
-                self.dfs(i[0], visites, composantes, power=power) 
-                #ici est la recursion de la fonction. On lui demande de s'appliquer elle-même à chaque noeud qui n'est pas 
-                #encore présent dans la liste "visites". On rajoute également une condition sur la puissance lorsque cela est nécessaire. 
+        stack = [iter(self.graph[node])]
+        while stack:
+            for i in stack[-1]:
+                if i[0] not in visites and (power is None or power >= i[1]):
+                    #on descend dans le voisin comme le faisait l'appel récursif, 
+                    #le reste des voisins du noeud courant sera parcouru au retour
+                    visites.add(i[0])
+                    composantes.append(i[0])
+                    stack.append(iter(self.graph[i[0]]))
+                    break
+            else:
+                stack.pop()
         return visites
-                
-#et on applique à nouveau la fonction pour qu elle visite tous les voisins des voisins etc...   
 
     def connected_components(self) :
-        visites = []
+        visites = set()
         gde_liste = []
         #on crée une grande liste qui sera une liste de liste de tous les noeuds reliés. C'es-à-dire que chaque liste 
         #présente dans la liste soit un graphe connexe avec tous les noeuds qu'elle contient. 
+        #on remplit en même temps component_id : noeud -> numéro de sa composante dans gde_liste
+        self.component_id = {}
         for i in self.graph:
             if i not in visites:
                 composantes=[]
-                #on a donc ici la liste de compostantes qui se reset à chaque itération tandis que la liste de visites
+                #on a donc ici la liste de compostantes qui se reset à chaque itération tandis que le set de visites
                 #reste inchangé. 
                 #Comme on parcours chaque noeud et que visites garde en mémoire tous les noeuds qui ont été visités,
                 #on a donc une nouvelle liste qui se crée qu'à condition qu'il n'y ait aucuun noeud dans une précédente liste.
                 self.dfs(i, visites, composantes)
+                for node in composantes:
+                    self.component_id[node] = len(gde_liste)
                 gde_liste.append(composantes)
         return gde_liste
+        # Chaque noeud et chaque arête sont vus une fois : O(|V|+|E|).
+
+    def component_ids(self):
+        """
+        Dictionary node -> number of its connected component (its index in connected_components()).
+        Computed by one pass of connected_components, then kept until the next add_edge.
+        """
+        if self.component_id is None:
+            self.connected_components()
+        return self.component_id
+
+    def connected(self, src, dest):
+        """True if there is a path between src and dest (whatever the power): O(1) after component_ids."""
+        ids = self.component_ids()
+        return src in ids and dest in ids and ids[src] == ids[dest]
         
     def bfs(self, beg, dest, power=-1):
         ancetres = {}
@@ -191,8 +248,29 @@ class Graph:
                     #on définit la valeur comme le noeur à partir duquel on est arrivés.
                     visited.add(v[0])
                     #et on le rajoute au set des visites comme pour éviter les boucles.
+                    if v[0] == dest:
+                        return ancetres
+                    #dès que dest est atteint son ancêtre ne changera plus : on peut s'arrêter là.
         return ancetres
 
+    def reachable_with_power(self, src, dest, power):
+        """
+        True if dest can be reached from src with this power.
+        Same traversal as bfs but without keeping the ancestors, and stopped as soon as dest is seen.
+        """
+        if src == dest:
+            return True
+        visited = {src}
+        stack = [src]
+        while stack:
+            for neighbor, power_min, _ in self.graph[stack.pop()]:
+                if power >= power_min and neighbor not in visited:
+                    if neighbor == dest:
+                        return True
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+        return False
+
 
     def BS(self, liste, power):
         #code de BS "de base" utilisé pour avoir une idée de comment coder le binary search de min_power
@@ -209,6 +287,12 @@ class Graph:
                 return mid
         return -1 #si on arrive la c est que l element etait po dans la liste
 
+    def connectivity_index(self):
+        """Power_Connectivity of the graph, built on the first call and kept until the next add_edge."""
+        if self.power_index is None:
+            self.power_index = Power_Connectivity(self)
+        return self.power_index
+
     def power_nodes(self, node1, node2): #fonction un peu inutile utilisée à des fins d'entraînement
         liste = self.graph[node1]
         for i in liste:
@@ -216,86 +300,251 @@ class Graph:
                 power = i[3]
         return power
     
-    def min_power(self, src, dest):
+    def distinct_powers(self):
+        """Sorted list of the distinct powers of the edges (kept until the next add_edge)."""
+        if self.sorted_powers is None:
+            self.sorted_powers = sorted({power for _, _, power in self.list_of_edges})
+        return self.sorted_powers
 
-        debut = 1
+    def min_power(self, src, dest):
 
-        fin = self.max_power
+        if src == dest:
 
-        actu=self.get_path_with_power(src, dest, self.max_power)
+            return [src], 0
 
-        if actu is None or dest not in actu:
+        if not self.connected(src, dest):
 
             return None, None
 
         #si les deux noeuds en question ne sont pas sur un graphe connexe, on retourne none car il n'y a pas de chemins possible. 
 
-        while debut != fin: 
+        #La puissance minimale est forcément la puissance d'une des arêtes : on fait la recherche binaire
 
-            #on fait une recherche binaire. 
+        #sur la liste triée des puissances distinctes plutôt que sur tous les entiers entre 1 et max_power.
 
-            #Pour être tout à fait honnête, la condition sur le while est un peu désuète étant donné qu'on fait un break
+        powers = self.distinct_powers()
 
-            #avant que cette condition puisse se remplir mais c'est la solution qui a le mieux marché sur plusieurs tests : 
+        debut = 0
 
-            #network.1 et network.2, lentement mais sûrement.
+        fin = len(powers) - 1
 
-            mid = ((debut+fin)//2)
+        #la puissance powers[fin] (la plus grande) suffit toujours puisque src et dest sont dans la même composante.
 
-            actu=self.get_path_with_power(src, dest, power=mid)
+        while debut < fin:
 
-            #on actualise à chaque itération le graphe des sommets formant un graphe connexe et permettant un chemin. 
+            mid = (debut+fin)//2
 
-            if actu is not None and dest in actu:
+            #pour les étapes intermédiaires il suffit de savoir si dest est atteignable, sans construire le chemin.
 
-                fin = mid
-
-            #si le sommet qu'on veut atteindre est dans le graphe fait à partir de la médiane des puissances
+            if self.reachable_with_power(src, dest, powers[mid]):
 
-            #on redéfinit la "borne sup" comme étant l'ancien milieu pour retrécir notre champ de recherche.
+                fin = mid
 
             else:
 
-                debut=mid
+                debut = mid+1
 
-            #on procède pareillement mais avec la plus petite puissance dans le cas contraire.
+        minus = powers[fin]
 
-            if fin-debut == 1 :
-
-                break
-
-            #Comme on ne prend pas comme valeurs de power les puissances présentes dans le graphe mais simplement 
-
-            #les entiers situés entre la plus grande puissance et la plus petite, 
+        return self.get_path_with_power(src, dest, minus), minus
 
-            #la condition pour sortir de la boucle while est que la différence entre les deux extrêmes soit égale à un. 
+        # La complexité temporelle de cet algorithme est O((|V|+|E|)*log(P)) 
 
-            #Ainsi, cela signifierait que ce sont deux entiers qui se suivent et on doit donc nécessairement prendre 
+        # avec P le nombre de puissances distinctes dans le graphe (au plus |E|) :
 
-            #"fin" car début serait trop petit. 
+        # la boucle while s'exécute log(P) fois, chaque parcours s'arrêtant dès que dest est atteint,
 
-        minus=fin
+        # et min_power fait appel à la fin une seule fois à get_path_with_power de complexité O(|V|+|E|).
 
-        return self.get_path_with_power(src, dest, minus), minus
+    def min_power_dijkstra(self, src, dest, max_power=None):
+        """
+        Same output as min_power, (path, power), in a single pass: Dijkstra's algorithm where the "length" of a path
+        is the maximal power of its edges (bottleneck / minimax path) instead of the sum.
+        The search stops as soon as dest is popped from the heap: its power is then final.
+        Edges with a power above max_power (if given) are ignored, which prunes the search
+        when an upper bound is known; (None, None) is returned if dest cannot be reached under it.
+        Complexity: O(|E|log|V|) at most, no preprocessing needed.
+        """
+        if src not in self.graph or dest not in self.graph:
+            return None, None
+        best = {src: 0}
+        ancetres = {src: None}
+        done = set()
+        heap = [(0, src)]
+        while heap:
+            power, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            if node == dest:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = ancetres[node]
+                path.reverse()
+                return path, power
+            done.add(node)
+            for neighbor, power_min, _ in self.graph[node]:
+                if max_power is not None and power_min > max_power:
+                    continue
+                new_power = power if power > power_min else power_min
+                if neighbor not in best or new_power < best[neighbor]:
+                    best[neighbor] = new_power
+                    ancetres[neighbor] = node
+                    heapq.heappush(heap, (new_power, neighbor))
+        return None, None
 
-        #en testant cette fonction sur le network.2 avec comme noeuds 1 et 12, voici le résultat obtenu :
+    def connected_components_set(self):
+        return set(map(frozenset, self.connected_components()))
 
-        # ([1, 2, 4, 12], 52761). C'est assez long mais il parvient au résultat sans trop de soucis. 
-        
+    def min_power_LCA(self, src, dest):
+        """
+        Same output as min_power, (path, power), but answered on the MST with binary lifting.
+        The Kruskal_LCA engine is built on the first call and kept until the next add_edge.
+        """
+        if self.dynamic_mst is not None:
+            return self.dynamic_mst.min_power(src, dest)
+        if self.lca_engine is None:
+            self.lca_engine = Kruskal_LCA(self)
+        return self.lca_engine.min_power(src, dest)
+
+    def power_LCA(self, src, dest):
+        """Only the power of min_power_LCA (None if there is no path), without rebuilding the path."""
+        if self.dynamic_mst is not None:
+            return self.dynamic_mst.power(src, dest)
+        if self.lca_engine is None:
+            self.lca_engine = Kruskal_LCA(self)
+        return self.lca_engine.power(src, dest)
+
+    def cached_queries(self, maxsize=100000, with_path=True):
+        """
+        Query_Cache of the graph (min_power_LCA with memoization), created on the first call
+        and emptied by add_edge. maxsize and with_path are only used when it is created.
+        """
+        if self.query_cache is None:
+            self.query_cache = Query_Cache(self, maxsize, with_path)
+        return self.query_cache
 
-        # La complexité temporelle de cet algorithme est O((|V|+|E|)*log(P)) 
+    def incremental_mst(self):
+        """
+        Dynamic_MST of the graph, built on the first call and then kept up to date by add_edge
+        (instead of running kruskal again after each new edge).
+        """
+        if self.dynamic_mst is None:
+            self.dynamic_mst = Dynamic_MST(self)
+        return self.dynamic_mst
 
-        # avec |V| le nombre de noeuds et P la puissance maximale entre les noeuds parcourus.
+    def shortest_path_with_power(self, src, dest, power):
+        """
+        Shortest path (in distance) from src to dest using only the edges with a power <= power.
+        Returns (path, distance), or (None, None) if dest cannot be reached with this power.
+        """
+        adjacency = {node: [edge for edge in edges if edge[1] <= power] for node, edges in self.graph.items()}
+        distances, ancetres = dijkstra(adjacency, src, {dest})
+        if dest not in distances:
+            return None, None
+        return rebuild_path(ancetres, dest), distances[dest]
 
-        # La boucle while s'exécute log(P) fois au plus
+    def min_power_shortest_path(self, src, dest):
+        """
+        Among all the paths that can be used with the minimal power, the shortest one in distance.
+        The minimal power is given by the Kruskal_LCA engine (see min_power_LCA),
+        then Dijkstra runs on the edges whose power is at most this value.
+        Returns (path, power, distance), or (None, None, None) if there is no path.
+        """
+        power = self.min_power_LCA(src, dest)[1]
+        if power is None:
+            return None, None, None
+        path, distance = self.shortest_path_with_power(src, dest, power)
+        return path, power, distance
 
-        # et min-power fait appel à la fin à get_path_with_power de complexité O(|V|+|E|),
+    def min_power_shortest_paths(self, routes):
+        """
+        Batched version of min_power_shortest_path for a list of (src, dest) routes.
+        The routes are grouped by minimal power and the groups are processed by increasing power:
+        the filtered graph (edges with power <= threshold) is then built once for all, each threshold only adding
+        the new edges to the previous one (O(|E|) in total), and one Dijkstra is ran per source in each group.
+        Returns the list of (path, power, distance), in the same order as routes.
+        """
+        results = [(None, None, None)]*len(routes)
+        groups = {}
+        for k, (src, dest) in enumerate(routes):
+            power = self.min_power_LCA(src, dest)[1]
+            if power is not None:
+                groups.setdefault(power, {}).setdefault(src, []).append((dest, k))
+        edges = sorted(self.list_of_edges_with_dist(), key=lambda item: item[2])
+        adjacency = {node: [] for node in self.graph}
+        p = 0
+        for power in sorted(groups):
+            while p < len(edges) and edges[p][2] <= power:
+                node1, node2, power_min, dist = edges[p]
+                adjacency[node1].append((node2, power_min, dist))
+                adjacency[node2].append((node1, power_min, dist))
+                p += 1
+            for src, queries in groups[power].items():
+                distances, ancetres = dijkstra(adjacency, src, {dest for dest, _ in queries})
+                for dest, k in queries:
+                    results[k] = (rebuild_path(ancetres, dest), power, distances[dest])
+        return results
+
+    def list_of_edges_with_dist(self):
+        """The edges as (node1, node2, power, dist) tuples, each one once (read from the adjacency lists)."""
+        edges = []
+        processed = set()
+        for node, neighbors in self.graph.items():
+            loop = False
+            for neighbor, power, dist in neighbors:
+                # an edge appears in the lists of both ends (we keep it with the first one), twice in the same list for a loop
+                if neighbor == node:
+                    loop = not loop
+                    if not loop:
+                        continue
+                elif neighbor in processed:
+                    continue
+                edges.append((node, neighbor, power, dist))
+            processed.add(node)
+        return edges
+    
 
-        # d'où la complexité totale de l'algorithme. 
+def dijkstra(adjacency, src, targets=None):
+    """
+    Dijkstra's algorithm on the distances of an adjacency dictionary node -> [(neighbor, power, dist), ...].
+    Stops once every node of targets (all the nodes if None) is settled.
+    Returns (distances, ancetres): the distance of each settled node and the node from which it was reached.
+    """
+    distances = {}
+    ancetres = {src: None}
+    best = {src: 0}
+    remaining = None if targets is None else set(targets)
+    heap = [(0, src)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if node in distances:
+            continue
+        distances[node] = distance
+        if remaining is not None:
+            remaining.discard(node)
+            if not remaining:
+                break
+        for neighbor, _, dist in adjacency.get(node, []):
+            new_distance = distance + dist
+            if neighbor not in distances and (neighbor not in best or new_distance < best[neighbor]):
+                best[neighbor] = new_distance
+                ancetres[neighbor] = node
+                heapq.heappush(heap, (new_distance, neighbor))
+    return distances, ancetres
+
+
+def rebuild_path(ancetres, dest):
+    """Path from the source to dest, read backwards in the ancetres dictionary (None if dest was not reached)."""
+    if dest not in ancetres:
+        return None
+    path = []
+    while dest is not None:
+        path.append(dest)
+        dest = ancetres[dest]
+    path.reverse()
+    return path
 
-    def connected_components_set(self):
-        return set(map(frozenset, self.connected_components()))
-    
 
 def graph_from_file(filename):
     """
@@ -316,20 +565,76 @@ def graph_from_file(filename):
     -----------
     g: Graph
         An object of the class Graph with the graph from file_name.
+
+    The whole file is parsed at once by read_network_arrays, then the adjacency lists are built
+    from the arrays of edges (see graph_from_arrays) instead of calling add_edge on each line.
     """
-    with open(filename, "r") as file:
-        n, m = map(int, file.readline().split())
-        g = Graph(range(1, n+1))
-        for _ in range(m):
-            edge = list(map(int, file.readline().split()))
-            if len(edge) == 3:
-                node1, node2, power_min = edge
-                g.add_edge(node1, node2, power_min) # will add dist=1 by default
-            elif len(edge) == 4:
-                node1, node2, power_min, dist = edge
-                g.add_edge(node1, node2, power_min, dist)
-            else:
+    n, edges = read_network_arrays(filename)
+    return graph_from_arrays(n, edges)
+
+
+def read_network_arrays(filename):
+    """
+    Reads a network.x.in file in one go (a single read and split) and returns its edges as an array.
+    Files with only 3 or only 4 columns are converted in one vectorized step,
+    files mixing both formats are parsed line by line.
+
+    Outputs: 
+    -----------
+    n: int
+        The number of nodes
+    edges: numpy.ndarray
+        An (m, 4) array of integers whose rows are 'node1 node2 power_min dist' (dist is 1 when missing).
+    """
+    with open(filename, "rb") as file:
+        data = file.read()
+    header, _, body = data.partition(b"\n")
+    n, m = map(int, header.split())
+    values = body.split()
+    edges = np.ones((m, 4), dtype=np.int64)
+    if len(values) == 4*m:
+        edges[:, :] = np.array(values, dtype=np.int64).reshape(m, 4)
+    elif len(values) == 3*m:
+        edges[:, :3] = np.array(values, dtype=np.int64).reshape(m, 3)
+    else:
+        lines = [line for line in body.splitlines() if line.strip()]
+        if len(lines) < m:
+            raise Exception("Format incorrect")
+        for i in range(m):
+            edge = lines[i].split()
+            if len(edge) not in (3, 4):
                 raise Exception("Format incorrect")
+            edges[i, :len(edge)] = list(map(int, edge))
+    return n, edges
+
+
+def graph_from_arrays(n, edges):
+    """
+    Builds the Graph of nodes 1..n from an (m, 4) array of edges 'node1 node2 power_min dist'.
+    The result is the same as calling add_edge on each row (same order in the adjacency lists),
+    but the half edges are grouped by node with a stable sort instead of m membership checks and appends.
+    """
+    m = len(edges)
+    if m and (edges[:, :2].min() < 1 or edges[:, :2].max() > n):
+        # nodes outside of 1..n: add_edge takes care of adding them
+        g = Graph(range(1, n+1))
+        for node1, node2, power_min, dist in edges.tolist():
+            g.add_edge(node1, node2, power_min, dist)
+        return g
+    # half edge 2k is node1 -> node2 and half edge 2k+1 is node2 -> node1, as appended by add_edge
+    sources = edges[:, :2].reshape(-1)
+    targets = edges[:, 1::-1].reshape(-1)
+    order = np.argsort(sources, kind="stable")
+    offsets = [0] + np.cumsum(np.bincount(sources, minlength=n+1)[1:]).tolist()
+    half_edges = list(zip(targets[order].tolist(), np.repeat(edges[:, 2], 2)[order].tolist(),
+                          np.repeat(edges[:, 3], 2)[order].tolist()))
+    g = Graph()
+    g.nodes = list(range(1, n+1))
+    g.nb_nodes = n
+    g.graph = {node: half_edges[offsets[node-1]:offsets[node]] for node in g.nodes}
+    g.nb_edges = m
+    g.list_of_edges = list(zip(*edges[:, :3].T.tolist()))
+    g.max_power = max(0, int(edges[:, 2].max())) if m else 0
     return g
 
 
@@ -378,6 +683,58 @@ class Union_Find():
         Therefore we always have n-1 edges on a n-nodes tree.
         
         """
+
+
+class Disjoint_Set():
+    """
+    A compact union-find: one array of parents and one array of sizes, indexed by node number.
+    Nodes are renamed 0..n-1 through the index dictionary so any label works (not only 1..n).
+    find uses path halving (each visited node is linked to its grandparent)
+    and union links the smaller set below the larger one (union by size),
+    so that each operation costs O(α(V)) amortised.
+    """
+
+    def __init__(self, nodes):
+        """
+        Parameters: 
+        -----------
+        nodes: list
+            The labels of the nodes, each one starting in its own set.
+        """
+        self.labels = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.labels)}
+        self.parent = array("i", range(len(self.labels)))
+        self.size = array("i", [1])*len(self.labels)
+
+    def find_index(self, i):
+        """Root of the set of the node of index i."""
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def find(self, node):
+        """Label of the representative of the set of node."""
+        return self.labels[self.find_index(self.index[node])]
+
+    def union_index(self, i, j):
+        """Merges the sets of the nodes of index i and j, returns False if they were already merged."""
+        i = self.find_index(i)
+        j = self.find_index(j)
+        if i == j:
+            return False
+        if self.size[i] < self.size[j]:
+            i, j = j, i
+        self.parent[j] = i
+        self.size[i] += self.size[j]
+        return True
+
+    def union(self, node1, node2):
+        """Merges the sets of node1 and node2, returns False if they were already merged."""
+        return self.union_index(self.index[node1], self.index[node2])
+
+
 def kruskal(input_graph):
     """
     Gives the minimum spanning tree (MST) of an input graph using Kruskal's algorithm
@@ -387,28 +744,25 @@ def kruskal(input_graph):
     (This algorithm works adequately on one graph at a time)
     """
     MST = Graph()
-    MST.nb_edges = input_graph.nb_nodes - 1
     # Sorting edges in a nondecreasing order of their power: 
     # the spanning tree produced by iteration will then necessarily be a MST
-    input_graph.graph = sorted(input_graph.list_of_edges, key=lambda item: item[2])
+    # (the sorted list is kept aside: the adjacency of input_graph must stay usable afterwards)
+    edges = sorted(input_graph.list_of_edges, key=lambda item: item[2])
     # we use an index (p) to go through these edges in an increasing order of power
     p = 0
-    nodes = {}
-    for node in input_graph.nodes:
-        nodes[node] = Union_Find()
-        nodes[node].set_up()
+    sets = Disjoint_Set(input_graph.nodes)
+    index = sets.index
     # When our MST in progress will have |V|-1 edges, it will be complete (see above, Q. 11)
     e = 0
-    while e < len(input_graph.nodes)-1 and p < len(input_graph.graph):
+    while e < len(input_graph.nodes)-1 and p < len(edges):
         # we consider the edge with the smallest power each time
-        n1, n2, power = input_graph.graph[p]
+        n1, n2, power = edges[p]
         p = p+1
-        # if adding the edge doesn't create a cycle, we add it to our MST in progress
-        if nodes[n1].find() != nodes[n2].find():
+        # if adding the edge doesn't create a cycle (the nodes were not connected yet and are merged now),
+        # we add it to our MST in progress: one find per end of the edge
+        if sets.union_index(index[n1], index[n2]):
             MST.add_edge(n1, n2, power)
             e = e+1
-            # and we take into account that the nodes are now connected
-            nodes[n1].union(nodes[n2])
     return MST
 
     # La complexité temporelle de kruskal est O(|V|) et celle de min_power est O((|V|+|E|)*log(P)), 
@@ -416,126 +770,757 @@ def kruskal(input_graph):
     # celle de min_power_kruskal_V1 est donc O(|V| + (|V|+|E|)*log(P)) = O(|V|log|V|)​
 
 
+class Power_Connectivity():
+    """
+    Index of the connectivity of a graph under every power threshold, built by one sweep of the edges
+    sorted by power, as in kruskal().
+    The union-find keeps its history: links are never compressed, and each link remembers the power
+    of the edge that created it. The set of a node when only the edges of power <= p are used is found by
+    following the links created at a power <= p. With union by size the chains have at most log2(V) links,
+    so is_reachable and component_of cost O(log(V)) and no traversal of the graph is needed.
+    """
+
+    def __init__(self, input_graph):
+        """Complexity: O(|E|log|E|) for the sort, then O(|E|log|V|)."""
+        self.labels = list(input_graph.nodes)
+        self.index = {node: i for i, node in enumerate(self.labels)}
+        n = len(self.labels)
+        parent = array("i", range(n))
+        size = array("i", [1])*n
+        # link_power[i]: power of the edge that linked i below parent[i]
+        link_power = [0]*n
+        index = self.index
+        for n1, n2, power in sorted(input_graph.list_of_edges, key=lambda item: item[2]):
+            i = index[n1]
+            while parent[i] != i:
+                i = parent[i]
+            j = index[n2]
+            while parent[j] != j:
+                j = parent[j]
+            if i == j:
+                continue
+            if size[i] < size[j]:
+                i, j = j, i
+            parent[j] = i
+            size[i] += size[j]
+            link_power[j] = power
+        self.parent = parent
+        self.link_power = link_power
+
+    def _root(self, i, power):
+        parent, link_power = self.parent, self.link_power
+        while parent[i] != i and link_power[i] <= power:
+            i = parent[i]
+        return i
+
+    def component_of(self, node, power):
+        """Label of the representative of the component of node using only the edges of power <= power."""
+        return self.labels[self._root(self.index[node], power)]
+
+    def is_reachable(self, src, dest, power):
+        """True if dest can be reached from src with this power (same answer as Graph.reachable_with_power)."""
+        i = self.index.get(src)
+        j = self.index.get(dest)
+        if i is None or j is None:
+            return False
+        return i == j or self._root(i, power) == self._root(j, power)
+
+
+def kruskal_offline(input_graph, queries):
+    """
+    Offline version of min_power for a batch of queries known in advance (e.g. a whole routes.x.in file).
+    During the union-find sweep of kruskal we build the Kruskal reconstruction tree (KRT):
+    each union of two components creates a new node, parent of both, labelled with the power of the edge.
+    The minimal power between src and dest is the label of their LCA in the KRT,
+    and all the LCAs are found at once with Tarjan's offline algorithm.
+    Complexity: O(|E|log|E|) for the sort, then near linear O((|V|+|E|+Q)α(V)) for the rest.
+
+    Parameters: 
+    -----------
+    input_graph: Graph
+    queries: list of (src, dest) pairs
+
+    Outputs: 
+    -----------
+    powers: list
+        The minimal power of each query, in the same order (None if src and dest are not connected).
+    """
+    labels = list(input_graph.nodes)
+    index = {node: i for i, node in enumerate(labels)}
+    n = len(labels)
+    # the KRT has at most 2n-1 nodes: the n leaves then one node per edge of the MST
+    uf = list(range(n))
+    krt_parent = list(range(n))
+    weight = [0]*n
+    children = [()]*n
+
+    def find(x):
+        # path halving: every visited node is linked to its grandparent
+        while uf[x] != x:
+            uf[x] = uf[uf[x]]
+            x = uf[x]
+        return x
+
+    for n1, n2, power in sorted(input_graph.list_of_edges, key=lambda item: item[2]):
+        a = find(index[n1])
+        b = find(index[n2])
+        if a != b:
+            new_node = len(uf)
+            uf[a] = new_node
+            uf[b] = new_node
+            uf.append(new_node)
+            krt_parent[a] = new_node
+            krt_parent[b] = new_node
+            krt_parent.append(new_node)
+            weight.append(power)
+            children.append((a, b))
+    # Tarjan's offline LCA on the KRT forest (iterative DFS)
+    powers = [None]*len(queries)
+    pending = [[] for _ in range(n)]
+    for q, (src, dest) in enumerate(queries):
+        i = index.get(src)
+        j = index.get(dest)
+        if i is None or j is None or find(i) != find(j):
+            continue
+        pending[i].append((j, q))
+        pending[j].append((i, q))
+    nb_krt = len(uf)
+    ancestor = list(range(nb_krt))
+    visited = [False]*nb_krt
+
+    def find_ancestor(x):
+        while ancestor[x] != x:
+            ancestor[x] = ancestor[ancestor[x]]
+            x = ancestor[x]
+        return x
+
+    for root in range(nb_krt):
+        if krt_parent[root] != root:
+            continue
+        stack = [(root, False)]
+        while stack:
+            x, done = stack.pop()
+            if not done:
+                stack.append((x, True))
+                for child in children[x]:
+                    stack.append((child, False))
+                continue
+            visited[x] = True
+            if x < n:
+                for other, q in pending[x]:
+                    if visited[other]:
+                        powers[q] = weight[find_ancestor(other)]
+            # x is finished: its subtree now answers to its parent (still open)
+            ancestor[x] = krt_parent[x]
+    return powers
+
+
+def read_routes_file(filename):
+    """
+    Reads a routes.x.in file and returns the list of routes as (src, dest, utility) tuples.
+    """
+    routes = []
+    for chunk in iter_routes_file(filename):
+        routes.extend(chunk)
+    return routes
+
+
+def read_routes_arrays(filename):
+    """Same as read_routes_file, as an (T, 3) numpy array of integers read in one go."""
+    with open(filename, "rb") as file:
+        header, _, body = file.read().partition(b"\n")
+    nb_routes = int(header.split()[0])
+    values = body.split()
+    if len(values) == 3*nb_routes:
+        return np.array(values, dtype=np.int64).reshape(nb_routes, 3)
+    return np.array(read_routes_file(filename), dtype=np.int64).reshape(-1, 3)
+
+
+def iter_routes_file(filename, chunk_size=10000):
+    """
+    Generator version of read_routes_file: yields the routes by lists of at most chunk_size (src, dest, utility) tuples,
+    so that only one chunk is in memory at a time, whatever the size of the file.
+    """
+    with open(filename, "r") as file:
+        nb_routes = int(file.readline().split()[0])
+        while nb_routes > 0:
+            lines = list(islice(file, min(chunk_size, nb_routes)))
+            if not lines:
+                break
+            nb_routes -= len(lines)
+            chunk = []
+            for line in lines:
+                src, dest, utility = map(int, line.split()[:3])
+                chunk.append((src, dest, utility))
+            yield chunk
+
+
+def routes_out_name(routes_file):
+    """routes.x.in -> routes.x.out"""
+    return routes_file[:-3] + ".out" if routes_file.endswith(".in") else routes_file + ".out"
+
+
+def answer_routes_offline(input_graph, routes_file, out_file=None):
+    """
+    Same as Kruskal_LCA.answer_routes, using kruskal_offline on the whole file at once.
+    Returns the name of the output file.
+    """
+    if out_file is None:
+        out_file = routes_out_name(routes_file)
+    routes = read_routes_file(routes_file)
+    powers = kruskal_offline(input_graph, [(src, dest) for src, dest, _ in routes])
+    with open(out_file, "w") as out:
+        out.writelines(f"{power}\n" for power in powers)
+    return out_file
+
+
 def min_power_kruskal(input_graph, src, dest):
     """
     New version of the min_power function, 
     Gives the path with the minimum power between two given nodes
     A twist to bring complexity down and time performance up:
-    - preprocessing with the kruskal algorithm
-    The complexity is then lowered to O(|V|)
+    - preprocessing with the kruskal algorithm, done once per graph (Kruskal_LCA, kept until the next add_edge)
+    - each query then climbs the MST in O(log(V))
     """
-    # Step n° 1: Preprocessing
-    MST = kruskal(input_graph)
-    #Step n° 2: running the usual min_power on the generated MST
-    path, power = min_power(MST, src, dest)
-    return path, power
+    return input_graph.min_power_LCA(src, dest)
 
 
-def min_power_kruskal_LCA(input_graph, src, dest, power):
+def min_power_kruskal_LCA(input_graph, src, dest):
     """
     New version of the min_power function, 
     Gives the path with the minimum power between two given nodes
     Two twists bring complexity down and time performance up:
     - preprocessing with the kruskal algorithm
     - lowest common ancestor (LCA) search instead of DFS to find paths before power-sorting them
-    This shoumd allow to bring complexity down to O(|log(V)|)
+    The preprocessing is done once per graph (see Graph.min_power_LCA),
+    each query is then answered in O(log(V)) (plus the length of the path)
+    """
+    return input_graph.min_power_LCA(src, dest)
+
+
+def power_array(values):
+    """
+    Numpy array of powers (any nesting of sequences): int64, or float64 when some power is not an integer,
+    so that non integer powers are never truncated.
+    """
+    powers = np.asarray(values)
+    return powers.astype(np.float64 if powers.dtype.kind == "f" else np.int64)
+
+
+def lifting_tables(parent, parent_power, depth):
+    """
+    Binary lifting tables of a rooted forest given by the parent (itself for a root) and the power of the edge
+    to the parent of each node: the 2^k-th ancestor is the 2^(k-1)-th ancestor of the 2^(k-1)-th ancestor.
+    Returns (up, max_up), lists of log rows of n values (see Kruskal_LCA).
     """
-    # Step n° 1: Preprocessing
-    MST = kruskal(input_graph)
-    # Step n°2: Lowest common ancestor
-def cw(filename):
+    n = len(parent)
+    log = max(1, max(depth, default=0).bit_length())
+    ups = [parent]
+    max_ups = [parent_power]
+    for k in range(1, log):
+        up, max_up = ups[k-1], max_ups[k-1]
+        ups.append([up[up[i]] for i in range(n)])
+        max_ups.append([max(max_up[i], max_up[up[i]]) for i in range(n)])
+    return ups, max_ups
+
+
+class Kruskal_LCA():
+    """
+    A query engine for min_power built once on the MST of a graph.
+
+    The MST (a forest if the graph is not connected) is rooted and we store, for each node:
+    its depth, its component and binary lifting tables, that is
+        up[k][i] = the 2^k-th ancestor of node i
+        max_up[k][i] = the maximal power on the edges between node i and up[k][i]
+    The minimal power between two nodes is the maximal power on their path in the MST,
+    which is read while climbing to their lowest common ancestor: O(log(V)) per query.
+    Nodes are renamed 0..n-1 internally (index / labels) so any hashable label works.
+    """
+
+    def __init__(self, input_graph):
+        """
+        Builds the MST of input_graph with kruskal() and precomputes the tables.
+        Complexity: O(|E|log|E|) for kruskal, then O(|V|log|V|) for the tables.
+        """
+        MST = kruskal(input_graph)
+        self.labels = list(input_graph.nodes)
+        self.index = {node: i for i, node in enumerate(self.labels)}
+        n = len(self.labels)
+        self.nb_nodes = n
+        parent = list(range(n))
+        parent_power = [0]*n
+        self.depth = [0]*n
+        self.component = [-1]*n
+        # 1. rooting every tree of the forest with an iterative BFS (no recursion limit issue)
+        for root in range(n):
+            if self.component[root] != -1:
+                continue
+            self.component[root] = root
+            queue = [root]
+            for i in queue:
+                for neighbor, power, _ in MST.graph.get(self.labels[i], []):
+                    j = self.index[neighbor]
+                    if self.component[j] == -1:
+                        self.component[j] = root
+                        parent[j] = i
+                        parent_power[j] = power
+                        self.depth[j] = self.depth[i] + 1
+                        queue.append(j)
+        # 2. binary lifting tables
+        self.up, self.max_up = lifting_tables(parent, parent_power, self.depth)
+        self.log = len(self.up)
+        # numpy copies of the tables and labels, built on demand for the batch queries
+        self.np_tables = None
+        self.np_labels = None
+
+    @classmethod
+    def from_tables(cls, labels, depth, component, up, max_up, index=None):
+        """
+        Rebuilds an engine from tables computed elsewhere (see cache.py and parallel.py), without running kruskal.
+        The tables are used as given (not copied): any sequences of integers will do, e.g. lists or memoryviews.
+        up and max_up are sequences of log rows of n values.
+        index (label -> node number, anything with a get method) is built from labels if not given.
+        """
+        engine = cls.__new__(cls)
+        engine.labels = labels
+        engine.index = {node: i for i, node in enumerate(labels)} if index is None else index
+        engine.nb_nodes = len(labels)
+        engine.depth = depth
+        engine.component = component
+        engine.up = list(up)
+        engine.max_up = list(max_up)
+        engine.log = len(engine.up)
+        engine.np_tables = None
+        engine.np_labels = None
+        return engine
+
+    def mst_edges(self):
+        """The edges (node1, node2, power) of the MST, read from the parent of each node."""
+        parent, parent_power = self.up[0], self.max_up[0]
+        return [(self.labels[i], self.labels[parent[i]], parent_power[i]) for i in range(self.nb_nodes) if parent[i] != i]
+
+    def _lca(self, i, j):
+        """Returns (lowest common ancestor, maximal power on the path) for two internal indices."""
+        depth, up, max_up = self.depth, self.up, self.max_up
+        best = 0
+        if depth[i] < depth[j]:
+            i, j = j, i
+        # we first bring i to the depth of j
+        diff = depth[i] - depth[j]
+        k = 0
+        while diff:
+            if diff & 1:
+                if max_up[k][i] > best:
+                    best = max_up[k][i]
+                i = up[k][i]
+            diff >>= 1
+            k += 1
+        if i == j:
+            return i, best
+        # then both climb as long as their ancestors differ
+        for k in range(self.log - 1, -1, -1):
+            if up[k][i] != up[k][j]:
+                best = max(best, max_up[k][i], max_up[k][j])
+                i = up[k][i]
+                j = up[k][j]
+        return up[0][i], max(best, max_up[0][i], max_up[0][j])
+
+    def power(self, src, dest):
+        """Minimal power needed to go from src to dest, None if they are not connected."""
+        i = self.index.get(src)
+        j = self.index.get(dest)
+        if i is None or j is None or self.component[i] != self.component[j]:
+            return None
+        return self._lca(i, j)[1]
+
+    def min_power(self, src, dest):
+        """
+        Same output as Graph.min_power: (path, power), or (None, None) if there is no path.
+        The path is the one of the MST, rebuilt by climbing from both ends to the LCA.
+        """
+        i = self.index.get(src)
+        j = self.index.get(dest)
+        if i is None or j is None or self.component[i] != self.component[j]:
+            return None, None
+        ancestor, power = self._lca(i, j)
+        parent = self.up[0]
+        path_src = [i]
+        while path_src[-1] != ancestor:
+            path_src.append(parent[path_src[-1]])
+        path_dest = []
+        while j != ancestor:
+            path_dest.append(j)
+            j = parent[j]
+        path = path_src + path_dest[::-1]
+        return [self.labels[k] for k in path], power
+
+    def answer_routes(self, routes_file, out_file=None, chunk_size=10000):
+        """
+        Answers a whole routes.x.in file in one pass and writes the minimal power of each route,
+        one per line and in the same order, in routes.x.out (or out_file if given).
+        The routes are read and the results written by chunks (see stream_routes), with a buffered output file.
+        Returns the name of the output file.
+        """
+        if out_file is None:
+            out_file = routes_out_name(routes_file)
+        with open(out_file, "w", buffering=2**20) as out:
+            for chunk in self.stream_routes(routes_file, chunk_size):
+                out.writelines(f"{power}\n" for power in chunk)
+        return out_file
+
+    def stream_routes(self, routes_file, chunk_size=10000):
+        """
+        Generator of the minimal powers of the routes of a file, by chunks of at most chunk_size values:
+        the memory used stays the same whatever the number of routes.
+        """
+        power = self.power
+        for chunk in iter_routes_file(routes_file, chunk_size):
+            yield [power(src, dest) for src, dest, _ in chunk]
+
+    def numpy_tables(self):
+        """
+        The tables as numpy arrays (built on the first call): depth, component, up (log x n) and max_up (log x n).
+        max_up is float64 when some power is not an integer (see power_array), int64 otherwise.
+        """
+        if self.np_tables is None:
+            self.np_tables = (np.asarray(self.depth, dtype=np.int64), np.asarray(self.component, dtype=np.int64),
+                              np.asarray(self.up, dtype=np.int64).reshape(self.log, self.nb_nodes),
+                              power_array(self.max_up).reshape(self.log, self.nb_nodes))
+        return self.np_tables
+
+    def indices_of(self, nodes):
+        """Node numbers of an array of labels, -1 for the unknown ones."""
+        nodes = np.asarray(nodes)
+        if self.np_labels is None:
+            self.np_labels = np.asarray(self.labels)
+            self.np_order = np.argsort(self.np_labels, kind="stable")
+        if len(self.np_labels) == 0:
+            return np.full(nodes.shape, -1, dtype=np.int64)
+        position = np.searchsorted(self.np_labels, nodes, sorter=self.np_order)
+        position = np.minimum(position, len(self.np_labels) - 1)
+        indices = self.np_order[position]
+        return np.where(self.np_labels[indices] == nodes, indices, -1)
+
+    def power_batch(self, src, dest):
+        """
+        Vectorized power for arrays of queries src[], dest[]: the binary lifting climb is done for all the queries
+        at once, one numpy operation per level of the tables (O(log V) operations in total).
+        Returns an int64 array (float64 for non integer powers) of minimal powers, -1 where src and dest are not connected.
+        """
+        depth, component, up, max_up = self.numpy_tables()
+        i = self.indices_of(src)
+        j = self.indices_of(dest)
+        known = (i >= 0) & (j >= 0)
+        i = np.where(known, i, 0)
+        j = np.where(known, j, 0)
+        connected = known & (component[i] == component[j])
+        # i is the deeper end of each query
+        swap = depth[i] < depth[j]
+        i, j = np.where(swap, j, i), np.where(swap, i, j)
+        best = np.zeros(len(i), dtype=max_up.dtype)
+        diff = depth[i] - depth[j]
+        for k in range(self.log):
+            climb = ((diff >> k) & 1).astype(bool)
+            best = np.where(climb, np.maximum(best, max_up[k][i]), best)
+            i = np.where(climb, up[k][i], i)
+        same = i == j
+        for k in range(self.log - 1, -1, -1):
+            a = up[k][i]
+            b = up[k][j]
+            climb = a != b
+            best = np.where(climb, np.maximum(best, np.maximum(max_up[k][i], max_up[k][j])), best)
+            i = np.where(climb, a, i)
+            j = np.where(climb, b, j)
+        best = np.where(same, best, np.maximum(best, np.maximum(max_up[0][i], max_up[0][j])))
+        return np.where(connected, best, -1)
+
+    def answer_routes_batch(self, routes_file, out_file=None):
+        """
+        Same output file as answer_routes, with the whole file parsed and answered by power_batch at once.
+        Returns the name of the output file.
+        """
+        if out_file is None:
+            out_file = routes_out_name(routes_file)
+        routes = read_routes_arrays(routes_file)
+        powers = self.power_batch(routes[:, 0], routes[:, 1]).astype(object)
+        powers[powers == -1] = None
+        with open(out_file, "w") as out:
+            out.write("".join(f"{power}\n" for power in powers.tolist()))
+        return out_file
+
+
+class Dynamic_MST():
+    """
+    A minimum spanning forest kept up to date while edges are added, without sorting the edges again.
+
+    When the edge (u, v, p) is added, the forest changes only if u and v were not connected (the edge links two trees)
+    or if p is smaller than the maximal power on the tree path between u and v: that edge is then swapped
+    for the new one (cycle property). The forest is stored rooted (parent, parent_power, depth), so the path is found
+    by climbing from both ends, and only the subtree that is cut off is rerooted.
+    The Kruskal_LCA tables of the forest are dropped when it changes and rebuilt from it (without kruskal)
+    on the next query; as long as they are valid, they also tell in O(log(V)) that a new edge changes nothing.
+    """
+
+    def __init__(self, input_graph):
+        """Starts from the MST of input_graph (kruskal() once)."""
+        engine = Kruskal_LCA(input_graph)
+        self.labels = list(engine.labels)
+        self.index = dict(engine.index)
+        self.parent = list(engine.up[0])
+        self.parent_power = list(engine.max_up[0])
+        self.depth = list(engine.depth)
+        # tree[i] = {neighbor: power} for the edges of the forest
+        self.tree = [{} for _ in self.labels]
+        for i, j in enumerate(self.parent):
+            if i != j:
+                self.tree[i][j] = self.parent_power[i]
+                self.tree[j][i] = self.parent_power[i]
+        self.engine = engine
+        self.nb_swaps = 0
+
+    def _node(self, node):
+        """Index of node, added as a tree of its own if it is new."""
+        i = self.index.get(node)
+        if i is None:
+            i = len(self.labels)
+            self.index[node] = i
+            self.labels.append(node)
+            self.parent.append(i)
+            self.parent_power.append(0)
+            self.depth.append(0)
+            self.tree.append({})
+            self.engine = None
+        return i
+
+    def _max_edge(self, i, j):
+        """
+        Climbs from i and j to their common ancestor. Returns (child end of the edge of maximal power on the path,
+        that power, True if this edge is on the side of i), or None if i and j are in different trees.
+        """
+        parent, parent_power, depth = self.parent, self.parent_power, self.depth
+        best = None
+        best_power = -1
+        side_i = True
+        while i != j:
+            if depth[i] >= depth[j]:
+                if parent[i] == i:
+                    return None
+                if parent_power[i] > best_power:
+                    best, best_power, side_i = i, parent_power[i], True
+                i = parent[i]
+            else:
+                if parent[j] == j:
+                    return None
+                if parent_power[j] > best_power:
+                    best, best_power, side_i = j, parent_power[j], False
+                j = parent[j]
+        return best, best_power, side_i
+
+    def _reroot(self, x, y, power):
+        """Hangs the tree of x (already cut from the rest) below y by the edge (x, y, power)."""
+        parent, parent_power, depth, tree = self.parent, self.parent_power, self.depth, self.tree
+        parent[x] = y
+        parent_power[x] = power
+        depth[x] = depth[y] + 1
+        stack = [x]
+        while stack:
+            i = stack.pop()
+            for j, p in tree[i].items():
+                if j != parent[i]:
+                    parent[j] = i
+                    parent_power[j] = p
+                    depth[j] = depth[i] + 1
+                    stack.append(j)
+
+    def add_edge(self, node1, node2, power):
+        """
+        Updates the forest with a new edge of the graph. Returns True if the forest changed.
+        Complexity: O(log(V)) when the tables are valid and the edge is useless,
+        otherwise the length of the tree path plus the size of the rerooted subtree.
+        """
+        i = self._node(node1)
+        j = self._node(node2)
+        if i == j:
+            return False
+        if self.engine is not None:
+            current = self.engine.power(node1, node2)
+            if current is not None and power >= current:
+                return False
+        found = self._max_edge(i, j)
+        if found is None:
+            # two trees are linked: the tree of i is hung below j
+            x, y = i, j
+        else:
+            child, max_power, side_i = found
+            if power >= max_power:
+                return False
+            # the edge (child, parent[child]) is removed: its subtree contains i (or j if the edge is on the side of j)
+            parent = self.parent[child]
+            del self.tree[child][parent]
+            del self.tree[parent][child]
+            self.nb_swaps += 1
+            x, y = (i, j) if side_i else (j, i)
+        self.tree[x][y] = power
+        self.tree[y][x] = power
+        self._reroot(x, y, power)
+        self.engine = None
+        return True
+
+    def lca(self):
+        """Kruskal_LCA engine of the current forest, rebuilt from the parent arrays if the forest changed."""
+        if self.engine is None:
+            n = len(self.labels)
+            component = list(range(n))
+            for i in sorted(range(n), key=self.depth.__getitem__):
+                component[i] = component[self.parent[i]]
+            up, max_up = lifting_tables(list(self.parent), list(self.parent_power), self.depth)
+            self.engine = Kruskal_LCA.from_tables(self.labels, list(self.depth), component, up, max_up, self.index)
+        return self.engine
+
+    def power(self, src, dest):
+        """Minimal power needed to go from src to dest, None if they are not connected."""
+        return self.lca().power(src, dest)
+
+    def min_power(self, src, dest):
+        """Same output as Graph.min_power: (path, power), or (None, None) if there is no path."""
+        return self.lca().min_power(src, dest)
+
+    def mst_edges(self):
+        """The edges (node1, node2, power) of the forest."""
+        return [(self.labels[i], self.labels[j], self.parent_power[i]) for i, j in enumerate(self.parent) if i != j]
+
+    def total_power(self):
+        """Sum of the powers of the edges of the forest."""
+        return sum(p for i, p in enumerate(self.parent_power) if self.parent[i] != i)
+
+
+class Query_Cache():
+    """
+    Memoization of the min power queries of a graph, for route files where the same pairs come back.
+    The graph is not oriented, so (src, dest) and (dest, src) share one entry (the path is reversed when needed).
+    At most maxsize pairs are kept, the least recently used one is dropped first.
+    The queries are answered on the MST (min_power_LCA), and the cache is emptied by Graph.add_edge.
+
+    Attributes:
+    -----------
+    maxsize: int
+    with_path: bool
+        If False only the powers are kept (and computed), which is cheaper.
+    hits, misses, evictions: int
+        Statistics since the creation of the cache (see stats).
+    """
+
+    def __init__(self, input_graph, maxsize=100000, with_path=True):
+        self.input_graph = input_graph
+        self.maxsize = maxsize
+        self.with_path = with_path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, src, dest):
+        """Cached (src of the entry, path, power) of the pair, computed on a miss."""
+        key = frozenset((src, dest))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        if self.with_path:
+            path, power = self.input_graph.min_power_LCA(src, dest)
+        else:
+            path, power = None, self.input_graph.power_LCA(src, dest)
+        entry = (src, path, power)
+        self.entries[key] = entry
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def power(self, src, dest):
+        """Minimal power needed to go from src to dest, None if they are not connected."""
+        return self._lookup(src, dest)[2]
+
+    def min_power(self, src, dest):
+        """Same output as Graph.min_power: (path, power), or (None, None) if there is no path."""
+        if not self.with_path:
+            raise ValueError("This cache does not keep the paths (with_path=False)")
+        first, path, power = self._lookup(src, dest)
+        if path is not None and first != src:
+            path = path[::-1]
+        return path, power
+
+    def clear(self):
+        """Forgets every entry (the statistics are kept)."""
+        self.entries.clear()
+
+    def stats(self):
+        """Hits, misses, evictions, hit rate and current number of entries."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self.entries),
+        }
+
+
+def allocation_from_files(filename, routes_file=None, trucks_file="trucks.x.in", Budget=25*10**9, method="bnb",
+                          memory_cap=256*2**20):
+    """
+    Whole truck allocation flow on files: minimal power of each route (Kruskal_LCA), cheapest truck per route,
+    then the allocation itself with allocation.allocate (see this module for the methods and the report).
+    routes_file defaults to the routes.x.in file matching network.x.in.
+    Returns the report of allocate, with also the routes and the trucks read.
+    """
+    if routes_file is None:
+        routes_file = os.path.join(os.path.dirname(filename), os.path.basename(filename).replace("network", "routes"))
+    g = graph_from_file(filename)
+    truck_powers, truck_costs = read_trucks_file(trucks_file)
+    routes = read_routes_file(routes_file)
+    engine = Kruskal_LCA(g)
+    min_powers = [engine.power(src, dest) for src, dest, _ in routes]
+    catalog = TruckCatalog(truck_powers, truck_costs)
+    items = route_candidates(min_powers, [utility for _, _, utility in routes], catalog)
+    result = allocate(items, Budget, method, memory_cap=memory_cap)
+    result["routes"] = routes
+    result["trucks"] = list(zip(truck_powers, truck_costs))
+    return result
+
+
+def cw(filename, routes_file=None, trucks_file="trucks.x.in", Budget=25*10**9, method="bnb"):
     """
     A main function with embedded driver code and initialisation
-    to run the recursive knapsack function below on our graph file
+    to run the truck allocation on our graph file
     Returns the trucks bought, the associated trajects, and the total profit
+    (allocation_from_files gives the full report, e.g. the quality against the upper bound)
     """
-    # 1. Initialisation
-    g = graph_from_file(filename)
-    Budget = 25*10**9
-    trucks = open("trucks.x.in", "r")
-    nb_trucks = int(trucks.readline().strip())
-    paths_cost_profit = []
-    # 2. setting up our matrix with truck costs and profits for each path
-    # 2.1. associate each truck power with a cost
-    truck_powers = []
-    truck_costs = []
-    for i, line in enumerate(trucks):
-        if i == 0:
-            continue  # Skip the first line
-        power, cost = map(int, line.split()[:2])
-        truck_powers.append(power)
-        truck_costs.append(cost)
-    # 2.2. find the minimum power for each traject
-    routes = read_routes_file("routes.x.in")
-    min_powers = []
-    for path in routes:
-        n1, n2, amount = map(int, path.split())
-        min_power = g.min_power_LCA(n1, n2)
-        min_powers.append(min_power)
-    # 2.3. associate each traject with a cost and a profit
-    for i, path in enumerate(routes):
-        for j, power in enumerate(truck_powers):
-            if power >= min_powers[i]:
-                cost = truck_costs[j]
-                profit = amount - cost
-                paths_cost_profit.append((i, j, cost, profit))
-    # now we have a list of paths with associated profits and costs, on which we can run our knapsack algorithm
-    # 3. Run the recursive knapsack function below and keep the associated trucks and paths
-    allocation, total_profit = knapsack(g, paths_cost_profit, Budget, len(paths_cost_profit))
+    result = allocation_from_files(filename, routes_file, trucks_file, Budget, method)
     trucks_and_paths = []
-    for i, j in allocation:
-        path = routes[i]
-        truck = (truck_powers[j], truck_costs[j])
-        trucks_and_paths.append((truck, path))
-    return trucks_and_paths, total_profit
+    for i, j, _, _ in result["allocation"]:
+        trucks_and_paths.append((result["trucks"][j], result["routes"][i]))
+    return trucks_and_paths, result["profit"]
 
 def knapsack(g, paths_cost_profit, Budget, N):
     """
-    (Optimized) recursive knapsack method applied to our truck allocation problem
-    Computes all profits associated to all sets of allocations and gives the global maximum
-    We use dynamic programming (DP) as a main resource to reduce complexity:
-
-    Complexity = O(|Number of paths * Budget|)
-    Auxiliary space = O(|Budget|)
+    Knapsack on our truck allocation problem, kept for compatibility:
+    a DP over every budget value needs O(Budget) memory (25*10**9 here), so this now runs
+    the cost-scaled DP of allocation.py, whose table is bounded in memory.
     Args:
-        g (graph): our initialized graph
-        paths_cost_profit (list): list of tuples with path cost, profit and associated truck power
+        g (graph): our initialized graph (unused)
+        paths_cost_profit (list): list of (path index, truck index, cost, profit) tuples
         Budget (int): 25*10**9
-        N (int): our recursive index for the knapsack algorithm
+        N (int): number of tuples of paths_cost_profit to consider
+    Returns the list of (path index, truck index) bought and the total profit
     """
-    # initialisation: DP vector with |Budget+1|-columns:
-    DP = [0 for x in range(Budget + 1)]
-    allocation = [[None for x in range(Budget + 1)] for y in range(N + 1)]
-    
-    for i in range(N + 1):
-        for w in range(Budget, 0, -1):
-            # we only need to consider the case where the cost is lower than the leftover budget
-            if paths_cost_profit[i-1][0] <= w:
-                # check if adding the path to the knapsack is profitable
-                if DP[w - paths_cost_profit[i-1][0]] + paths_cost_profit[i-1][1] > DP[w]:
-                    DP[w] = DP[w - paths_cost_profit[i-1][0]] + paths_cost_profit[i-1][1]
-                    allocation[i][w] = (i-1, w - paths_cost_profit[i-1][0])
-            # keep the previous value of DP[w]
-            else:
-                allocation[i][w] = allocation[i-1][w]
-    
-    # retrieve the paths and trucks in the allocation
-    trucks_and_paths = []
-    i = N
-    w = Budget
-    while i > 0 and w > 0:
-        # if the allocation at (i,w) is not the same as at (i-1,w)
-        if allocation[i][w] != allocation[i-1][w]:
-            truck_idx = paths_cost_profit[i-1][2]
-            path_idx = i-1
-            trucks_and_paths.append((truck_idx, path_idx))
-            w -= paths_cost_profit[i-1][0]
-        i -= 1
-        
-    return trucks_and_paths, DP[Budget]
+    result = allocate(paths_cost_profit[:N], Budget, method="dp")
+    return [(i, j) for i, j, _, _ in result["allocation"]], result["profit"]
 
 
-def greedy_approach(input_graph, routesfile, ):
+def greedy_approach(input_graph, routesfile, trucksfile="trucks.x.in", Budget=25*10**9):
     """ 
     Idea: start by sorting the paths by profit and then go one by one
     This relies heavily on our min_power_LCA earlier on
@@ -544,23 +1529,14 @@ def greedy_approach(input_graph, routesfile, ):
     Possibly the last truck + the leftover budget would have been better spent 
     by saturating the budget completely on less expensive trucks
     *** 
+    Paths are sorted by profit / cost ratio, and the result is compared with the most profitable single path:
+    the best of both is at least half of the global max.
+    Returns the list of (truck, path) bought and the total profit.
     """  
-        paths_and_trucks = []
-        Budget = 25*10**9
-        # Step n° 1: create a dict with path, min_power, truck, profit
-        X = {}
-        for n1, n2 in routes:
-            truck with truck_power >= min_power_LCA(input_graph, n1, n2, power)
-            cost(path) = cost(truck(path))
-            profit = gain(path) - cost(path)
-            X.append([path, min_power, truck, profit]) #find a better way than append to reduce time? new class? 
-        # Step n° 2: sort by profit (descending)
-        g.profit = sorted(X, key= lambda, item: item[profit], reverse = True)
-        # Step n° 3: saturate budget
-        while Budget > 0:
-            for i in range(len(g.profit)):
-                while Budget - cost > 0
-                paths_and_trucks.append()
-                Budget = Budget - cost()
-        # We now have a list of trucks and associated paths, sorted by profit
-        return paths_and_trucks
\ No newline at end of file
+    truck_powers, truck_costs = read_trucks_file(trucksfile)
+    routes = read_routes_file(routesfile)
+    min_powers = [input_graph.min_power_LCA(n1, n2)[1] for n1, n2, _ in routes]
+    items = route_candidates(min_powers, [utility for _, _, utility in routes], TruckCatalog(truck_powers, truck_costs))
+    result = allocate(items, Budget, method="greedy")
+    paths_and_trucks = [((truck_powers[j], truck_costs[j]), routes[i]) for i, j, _, _ in result["allocation"]]
+    return paths_and_trucks, result["profit"]
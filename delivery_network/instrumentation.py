@@ -0,0 +1,194 @@
+import argparse
+import cProfile
+import functools
+import json
+import pstats
+import runpy
+import sys
+import time
+
+import graph
+
+# Opt-in instrumentation of the hot paths: number of calls, time, and size of the work done
+# (nodes visited by a traversal, length of the paths...) for the functions of TARGETS.
+# Nothing is changed until enable() is called: the functions are then replaced by timed wrappers
+# (in their class or module, and in every module that imported them), and disable() puts the originals back,
+# so that there is no cost at all when the instrumentation is off.
+#     with instrumented():
+#         g.min_power(1, 12)
+#     print_report()
+# From the command line, to run a script with the instrumentation (and optionally cProfile):
+#     python delivery_network/instrumentation.py [--profile] [--json stats.json] delivery_network/benchmarks.py ...
+
+
+def _nb_visited_before_dfs(args, kwargs):
+    # dfs adds the nodes it visits to visites (when given) and returns it: the work is the growth of the set
+    visites = args[2] if len(args) > 2 else kwargs.get("visites")
+    return len(visites) if visites is not None else 0
+
+
+# (owner, attribute name, size of the work done computed from (args, kwargs, result) or None,
+#  and optionally the part of this size already there before the call, computed from (args, kwargs))
+TARGETS = [
+    (graph.Graph, "bfs", lambda args, kwargs, result: len(result)),
+    (graph.Graph, "dfs", lambda args, kwargs, result: len(result), _nb_visited_before_dfs),
+    (graph.Graph, "reachable_with_power", None),
+    (graph.Graph, "get_path_with_power", lambda args, kwargs, result: len(result) if result else 0),
+    (graph.Graph, "min_power", None),
+    (graph.Graph, "min_power_dijkstra", None),
+    (graph.Graph, "connected_components", lambda args, kwargs, result: len(result)),
+    (graph.Disjoint_Set, "find_index", None),
+    (graph.Disjoint_Set, "union_index", None),
+    (graph.Kruskal_LCA, "__init__", None),
+    (graph, "kruskal", lambda args, kwargs, result: result.nb_edges),
+    (graph, "graph_from_file", lambda args, kwargs, result: result.nb_edges),
+    (graph, "read_network_arrays", lambda args, kwargs, result: len(result[1])),
+]
+
+stats = {}
+_originals = {}
+
+
+def _record(name, elapsed, size):
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = {"calls": 0, "total_s": 0.0, "max_s": 0.0, "work": 0}
+    entry["calls"] += 1
+    entry["total_s"] += elapsed
+    if elapsed > entry["max_s"]:
+        entry["max_s"] = elapsed
+    if size is not None:
+        entry["work"] += size
+
+
+def _wrap(name, function, size, before=None):
+    if before is not None:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            initial = before(args, kwargs)
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            _record(name, elapsed, size(args, kwargs, result) - initial)
+            return result
+        return wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        _record(name, elapsed, size(args, kwargs, result) if size is not None else None)
+        return result
+    return wrapper
+
+
+def _replace_everywhere(old, new):
+    """Replaces the references to old by new in the globals of every loaded module (from graph import ...)."""
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not namespace:
+            continue
+        for key, value in list(namespace.items()):
+            if value is old:
+                namespace[key] = new
+
+
+def enable():
+    """Replaces the functions of TARGETS by instrumented wrappers (no effect if already enabled)."""
+    if _originals:
+        return
+    for owner, attribute, size, *before in TARGETS:
+        original = owner.__dict__[attribute]
+        name = f"{getattr(owner, '__name__', owner)}.{attribute}" if isinstance(owner, type) else attribute
+        wrapper = _wrap(name, original, size, *before)
+        _originals[(owner, attribute)] = (original, wrapper)
+        setattr(owner, attribute, wrapper)
+        if not isinstance(owner, type):
+            _replace_everywhere(original, wrapper)
+
+
+def disable():
+    """Puts the original functions back."""
+    for (owner, attribute), (original, wrapper) in _originals.items():
+        setattr(owner, attribute, original)
+        if not isinstance(owner, type):
+            _replace_everywhere(wrapper, original)
+    _originals.clear()
+
+
+def reset():
+    """Forgets the statistics recorded so far."""
+    stats.clear()
+
+
+class instrumented():
+    """Context manager: instrumentation enabled inside the with block (statistics are kept after it)."""
+
+    def __enter__(self):
+        enable()
+        return stats
+
+    def __exit__(self, *exc):
+        disable()
+        return False
+
+
+def report():
+    """Statistics by function: calls, total and mean time, maximal time, and total / mean work when measured."""
+    summary = {}
+    for name, entry in sorted(stats.items(), key=lambda item: -item[1]["total_s"]):
+        summary[name] = dict(entry)
+        summary[name]["mean_us"] = entry["total_s"] / entry["calls"] * 1e6
+        summary[name]["mean_work"] = entry["work"] / entry["calls"]
+    return summary
+
+
+def print_report(file=None):
+    file = file or sys.stdout
+    print(f"{'function':>32} {'calls':>10} {'total_s':>10} {'mean_us':>12} {'max_s':>10} {'mean_work':>12}", file=file)
+    for name, entry in report().items():
+        print(f"{name:>32} {entry['calls']:>10} {entry['total_s']:>10.4f} {entry['mean_us']:>12.2f} "
+              f"{entry['max_s']:>10.4f} {entry['mean_work']:>12.2f}", file=file)
+
+
+def dump_json(filename):
+    """Writes report() as JSON."""
+    with open(filename, "w") as out:
+        json.dump(report(), out, indent=2)
+
+
+def profile(function, *args, sort="cumulative", limit=30, out=None, **kwargs):
+    """
+    Runs function(*args, **kwargs) under cProfile, prints the limit first lines sorted by sort,
+    saves the raw profile in out (for snakeviz, pstats...) if given, and returns the result of the function.
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args, **kwargs)
+    if out is not None:
+        profiler.dump_stats(out)
+    pstats.Stats(profiler).sort_stats(sort).print_stats(limit)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs a python script with the Graph instrumentation enabled")
+    parser.add_argument("--profile", action="store_true", help="run the script under cProfile too")
+    parser.add_argument("--profile-out", default=None, help="file for the raw cProfile statistics")
+    parser.add_argument("--json", default=None, help="file for the instrumentation report")
+    parser.add_argument("script")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    sys.argv = [args.script] + args.arguments
+    with instrumented():
+        if args.profile:
+            profile(runpy.run_path, args.script, run_name="__main__", out=args.profile_out)
+        else:
+            runpy.run_path(args.script, run_name="__main__")
+    print_report(sys.stderr)
+    if args.json:
+        dump_json(args.json)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,112 @@
+import numpy as np
+
+from graph import Kruskal_LCA, power_array
+
+# All-pairs min power oracle for small and medium networks.
+# The minimal power between two nodes is the maximal power on their path in the MST, so a V x V matrix of these
+# bottlenecks answers any query with one lookup. The matrix is filled from the MST rooted by Kruskal_LCA:
+# taking the nodes tree by tree and by increasing depth, the nodes already placed form a subtree containing
+# the parent p of the next node c but none of its descendants, hence row c = max(row p, power of the edge c-p)
+# on them: one numpy operation per node instead of one traversal per node.
+# The memory needed (n^2 values of the smallest sufficient dtype) is estimated first: above memory_budget,
+# no matrix is built and the queries go to the LCA engine.
+
+
+def oracle_dtype(max_power):
+    """
+    Smallest numpy dtype holding the powers 0..max_power plus a larger value for the disconnected pairs
+    (unsigned integers, float64 if the powers are not integers).
+    """
+    if not isinstance(max_power, (int, np.integer)):
+        return np.dtype(np.float64)
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if max_power < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.float64)
+
+
+def oracle_memory(nb_nodes, max_power):
+    """Number of bytes of the matrix of an oracle on nb_nodes nodes whose powers are at most max_power."""
+    return nb_nodes * nb_nodes * oracle_dtype(max_power).itemsize
+
+
+class Power_Oracle():
+    """
+    Minimal power of every pair of nodes of a graph, answered in O(1).
+
+    Attributes:
+    -----------
+    engine: Kruskal_LCA
+        The LCA engine of the MST, used to build the matrix and for the queries when there is no matrix.
+    matrix: numpy array or None
+        matrix[row[i], row[j]] is the minimal power between the nodes of index i and j (engine numbering),
+        or the maximal value of the dtype (inf for floats) if they are not connected.
+        None when the matrix would take more than memory_budget bytes.
+    row: numpy array
+        Row of the matrix of each node.
+    """
+
+    def __init__(self, input_graph, memory_budget=256 * 2**20):
+        self.engine = Kruskal_LCA(input_graph)
+        n = self.engine.nb_nodes
+        # a single non integer power makes every power float (power_array), even if the maximum is an integer
+        parent_powers = power_array(self.engine.max_up[0])
+        max_power = parent_powers.max().item() if n else 0
+        self.dtype = oracle_dtype(max_power)
+        self.memory = oracle_memory(n, max_power)
+        self.matrix = None
+        self.row = None
+        if self.memory <= memory_budget:
+            self._build()
+
+    def _build(self):
+        depth, component, up, max_up = self.engine.numpy_tables()
+        n = self.engine.nb_nodes
+        order = np.lexsort((depth, component))
+        self.row = np.empty(n, dtype=np.int64)
+        self.row[order] = np.arange(n)
+        if self.dtype.kind == "f":
+            self.none = np.inf
+        else:
+            self.none = np.iinfo(self.dtype).max
+        matrix = np.full((n, n), self.none, dtype=self.dtype)
+        parent_row = self.row[up[0][order]].tolist()
+        powers = max_up[0][order].tolist()
+        roots = (up[0][order] == order).tolist()
+        start = 0
+        for k in range(n):
+            if roots[k]:
+                # first node of a new tree
+                start = k
+            else:
+                values = np.maximum(matrix[parent_row[k], start:k], powers[k])
+                matrix[k, start:k] = values
+                matrix[start:k, k] = values
+            matrix[k, k] = 0
+        self.matrix = matrix
+
+    def power(self, src, dest):
+        """Minimal power needed to go from src to dest, None if they are not connected."""
+        if self.matrix is None:
+            return self.engine.power(src, dest)
+        i = self.engine.index.get(src)
+        j = self.engine.index.get(dest)
+        if i is None or j is None:
+            return None
+        power = self.matrix[self.row[i], self.row[j]]
+        return None if power == self.none else power.item()
+
+    def power_batch(self, src, dest):
+        """
+        Same output as Kruskal_LCA.power_batch (int64 array, -1 where there is no path), by fancy indexing.
+        The powers are converted before -1 is put in (the matrix is unsigned), float64 for non integer powers.
+        """
+        if self.matrix is None:
+            return self.engine.power_batch(src, dest)
+        i = self.engine.indices_of(src)
+        j = self.engine.indices_of(dest)
+        known = (i >= 0) & (j >= 0)
+        powers = self.matrix[self.row[np.where(known, i, 0)], self.row[np.where(known, j, 0)]]
+        connected = known & (powers != self.none)
+        powers = powers.astype(np.float64 if self.dtype.kind == "f" else np.int64)
+        return np.where(connected, powers, -1)
@@ -0,0 +1,108 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from graph import Kruskal_LCA, iter_routes_file, power_array, routes_out_name
+
+# Answering the routes of a file with several processes.
+# The tables of a Kruskal_LCA engine are copied once in a block of shared memory,
+# laid out as 8 bytes values: depth (n) | component (n) | up (log x n) | max_up (log x n),
+# all int64 except max_up which is float64 when some power is not an integer (see power_array).
+# Each worker maps the block (no copy) and answers chunks of routes; the chunks are written back in order,
+# so that the output file is the same as with Kruskal_LCA.answer_routes.
+
+
+class Range_Index():
+    """label -> node number for the labels 1..n of the network files, without a dictionary."""
+
+    def __init__(self, n):
+        self.n = n
+
+    def get(self, node, default=None):
+        if isinstance(node, int) and 1 <= node <= self.n:
+            return node - 1
+        return default
+
+
+def share_tables(engine):
+    """
+    Copies the tables of engine in a new block of shared memory.
+    Returns the block (to be closed and unlinked by the caller) and the arguments needed by attach_engine.
+    """
+    n, log = engine.nb_nodes, engine.log
+    block = shared_memory.SharedMemory(create=True, size=max(8, 8 * n * (2 + 2*log)))
+    values = np.ndarray((2 + 2*log, n), dtype=np.int64, buffer=block.buf)
+    values[0] = engine.depth
+    values[1] = engine.component
+    values[2:2 + log] = engine.up
+    max_up = power_array(engine.max_up)
+    float_powers = max_up.dtype.kind == "f"
+    if float_powers:
+        np.ndarray((log, n), dtype=np.float64, buffer=block.buf, offset=8 * n * (2 + log))[:] = max_up
+    else:
+        values[2 + log:] = max_up
+    del values
+    if list(engine.labels) == list(range(1, n + 1)):
+        labels = None
+    else:
+        labels = list(engine.labels)
+    return block, (block.name, n, log, labels, float_powers)
+
+
+def attach_engine(name, n, log, labels, float_powers=False):
+    """
+    Kruskal_LCA engine whose tables are rows (memoryviews) of the shared block name.
+    Returns the block (kept open as long as the engine is used) and the engine.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    rows = block.buf.cast("q")
+    row = [rows[k*n:(k+1)*n] for k in range(2 + log)]
+    powers = block.buf.cast("d") if float_powers else rows
+    row += [powers[k*n:(k+1)*n] for k in range(2 + log, 2 + 2*log)]
+    if labels is None:
+        labels, index = range(1, n + 1), Range_Index(n)
+    else:
+        index = None
+    engine = Kruskal_LCA.from_tables(labels, row[0], row[1], row[2:2 + log], row[2 + log:], index)
+    return block, engine
+
+
+_worker = {}
+
+
+def _init_worker(name, n, log, labels, float_powers=False):
+    _worker["block"], _worker["engine"] = attach_engine(name, n, log, labels, float_powers)
+
+
+def _answer_chunk(chunk):
+    power = _worker["engine"].power
+    return [power(src, dest) for src, dest in chunk]
+
+
+def answer_routes_parallel(engine, routes_file, out_file=None, workers=None, chunk_size=10000):
+    """
+    Same as engine.answer_routes(routes_file, out_file), with the chunks of routes answered by a pool of processes.
+    At most 2 chunks per worker are waiting at any time, so that the memory stays bounded.
+    Returns the name of the output file.
+    """
+    if out_file is None:
+        out_file = routes_out_name(routes_file)
+    workers = workers or os.cpu_count() or 1
+    block, args = share_tables(engine)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=args) as pool, \
+                open(out_file, "w", buffering=2**20) as out:
+            pending = deque()
+            for chunk in iter_routes_file(routes_file, chunk_size):
+                pending.append(pool.submit(_answer_chunk, [(src, dest) for src, dest, _ in chunk]))
+                if len(pending) >= 2 * workers:
+                    out.writelines(f"{power}\n" for power in pending.popleft().result())
+            while pending:
+                out.writelines(f"{power}\n" for power in pending.popleft().result())
+    finally:
+        block.close()
+        block.unlink()
+    return out_file
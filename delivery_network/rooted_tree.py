@@ -0,0 +1,272 @@
+import numpy as np
+
+from boruvka import boruvka_arrays
+from csr_graph import CSR_Graph, compact_array
+from graph import read_network_arrays
+
+# A compact MST: the tree is rooted and stored as a few arrays per node instead of a Graph
+# (dict of lists of tuples plus list_of_edges). On top of it:
+#  - LCA in O(1): Euler tour of the tree and sparse table of minimums (by depth) over it (O(V log V) to build),
+#  - maximal power on a path in O(log^2 V): heavy-light decomposition, each heavy chain being a contiguous range
+#    of a segment tree (max) on the power of the edge between each node and its parent.
+
+
+class Rooted_Tree():
+    """
+    A rooted forest on the nodes 0..n-1 (the MST of a graph), with O(1) LCA and O(log^2 V) path maximum queries.
+
+    Attributes:
+    -----------
+    nb_nodes: int
+    parent, parent_power, depth: array
+        Parent of each node (itself for a root), power of the edge to the parent (0 for a root), depth.
+    component: array
+        Root of the tree of each node.
+    labels: list or None
+        labels[i] is the name of node i. None means that node i is named i+1, as in the network.x.in files.
+    euler, euler_depth, first: array
+        Euler tour of the forest (node numbers, 2n-r values for r trees), depth of each of its values,
+        and first position of each node in it.
+    sparse: list of arrays
+        sparse[k][p] is the position of the smallest depth among euler_depth[p:p + 2^k].
+    head, pos: array
+        Top of the heavy chain of each node, and position of each node in the segment tree
+        (the nodes of a chain are consecutive, from its head downwards).
+    segment: array
+        Segment tree (2n values, leaves at n + pos[i]) of the maximum of parent_power.
+    """
+
+    def __init__(self, parent, parent_power, labels=None):
+        """
+        Builds the tables from the parent array (a root is its own parent) and the powers of the edges to the parents.
+        Complexity: O(V log V), for the sparse table.
+        """
+        parent = np.asarray(parent, dtype=np.int64)
+        n = len(parent)
+        self.nb_nodes = n
+        self.labels = labels
+        self.index_of = None if labels is None else {node: i for i, node in enumerate(labels)}
+        nodes = np.arange(n)
+        is_child = parent != nodes
+        # children of each node, as a CSR (offsets, children)
+        children = nodes[is_child][np.argsort(parent[is_child], kind="stable")]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parent[is_child], minlength=n), out=offsets[1:])
+        offsets, children = offsets.tolist(), children.tolist()
+        parent_list = parent.tolist()
+        roots = nodes[~is_child].tolist()
+        # 1. BFS order, depths and components
+        depth = [0]*n
+        component = list(range(n))
+        order = list(roots)
+        for i in order:
+            for c in children[offsets[i]:offsets[i + 1]]:
+                depth[c] = depth[i] + 1
+                component[c] = component[i]
+                order.append(c)
+        # 2. subtree sizes, heavy child first among the children of each node
+        size = [1]*n
+        for i in reversed(order):
+            if parent_list[i] != i:
+                size[parent_list[i]] += size[i]
+        for i in range(n):
+            start, stop = offsets[i], offsets[i + 1]
+            if stop - start > 1:
+                heavy = max(range(start, stop), key=lambda k: size[children[k]])
+                children[start], children[heavy] = children[heavy], children[start]
+        # 3. one DFS (heavy child first) for the chains, the segment tree positions and the Euler tour
+        head = list(range(n))
+        pos = [0]*n
+        first = [0]*n
+        euler = []
+        cursor = offsets[:n]
+        position = 0
+        for root in roots:
+            stack = [root]
+            pos[root] = position
+            position += 1
+            first[root] = len(euler)
+            euler.append(root)
+            while stack:
+                i = stack[-1]
+                if cursor[i] < offsets[i + 1]:
+                    c = children[cursor[i]]
+                    if cursor[i] == offsets[i]:
+                        head[c] = head[i]
+                    cursor[i] += 1
+                    pos[c] = position
+                    position += 1
+                    first[c] = len(euler)
+                    euler.append(c)
+                    stack.append(c)
+                else:
+                    stack.pop()
+                    if stack:
+                        euler.append(stack[-1])
+        # 4. sparse table over the depths of the Euler tour
+        euler_depth = np.asarray(depth, dtype=np.int64)[euler] if euler else np.empty(0, dtype=np.int64)
+        level = np.arange(len(euler), dtype=np.int64)
+        self.sparse = [compact_array(level)]
+        width = 1
+        while 2*width <= len(euler):
+            a, b = level[:len(level) - width], level[width:]
+            level = np.where(euler_depth[a] <= euler_depth[b], a, b)
+            self.sparse.append(compact_array(level))
+            width *= 2
+        # 5. segment tree of the maximum of parent_power (leaves n..2n-1)
+        powers = np.asarray(parent_power, dtype=np.int64)
+        segment = np.zeros(2*n, dtype=np.int64)
+        segment[n + np.asarray(pos, dtype=np.int64)] = np.where(is_child, powers, 0)
+        # the internal nodes lo..hi-1 only depend on nodes >= hi, already computed: one numpy step per level
+        hi = n
+        while hi > 1:
+            lo = (hi + 1) // 2
+            inner = np.arange(lo, hi)
+            segment[inner] = np.maximum(segment[2*inner], segment[2*inner + 1])
+            hi = lo
+        self.parent = compact_array(parent)
+        self.parent_power = compact_array(np.where(is_child, powers, 0))
+        self.depth = compact_array(depth)
+        self.component = compact_array(component)
+        self.euler = compact_array(euler)
+        self.euler_depth = compact_array(euler_depth)
+        self.first = compact_array(first)
+        self.head = compact_array(head)
+        self.pos = compact_array(pos)
+        self.segment = compact_array(segment)
+
+    @classmethod
+    def from_edges(cls, nb_nodes, sources, targets, powers, labels=None):
+        """Roots (at the smallest node of each tree) the forest of edges (sources[k], targets[k], powers[k])."""
+        adjacency = CSR_Graph(nb_nodes, sources, targets, powers, np.zeros(len(sources), dtype=np.int64))
+        offsets, neighbors, edge_powers = adjacency.offsets, adjacency.neighbors, adjacency.powers
+        parent = list(range(nb_nodes))
+        parent_power = [0]*nb_nodes
+        seen = bytearray(nb_nodes)
+        for root in range(nb_nodes):
+            if seen[root]:
+                continue
+            seen[root] = 1
+            queue = [root]
+            for i in queue:
+                for k in range(offsets[i], offsets[i + 1]):
+                    j = neighbors[k]
+                    if not seen[j]:
+                        seen[j] = 1
+                        parent[j] = i
+                        parent_power[j] = edge_powers[k]
+                        queue.append(j)
+        return cls(parent, parent_power, labels)
+
+    @classmethod
+    def from_graph(cls, input_graph):
+        """Rooted MST of a Graph (computed with boruvka_arrays)."""
+        labels = list(input_graph.nodes)
+        index = {node: i for i, node in enumerate(labels)}
+        edges = input_graph.list_of_edges
+        sources = np.array([index[n1] for n1, _, _ in edges], dtype=np.int64)
+        targets = np.array([index[n2] for _, n2, _ in edges], dtype=np.int64)
+        powers = np.array([power for _, _, power in edges], dtype=np.int64)
+        kept = boruvka_arrays(len(labels), sources, targets, powers)
+        if labels == list(range(1, len(labels) + 1)):
+            labels = None
+        return cls.from_edges(len(index), sources[kept], targets[kept], powers[kept], labels)
+
+    @classmethod
+    def from_file(cls, filename):
+        """Rooted MST of a network.x.in file, without building the Graph."""
+        n, edges = read_network_arrays(filename)
+        kept = boruvka_arrays(n, edges[:, 0] - 1, edges[:, 1] - 1, edges[:, 2])
+        return cls.from_edges(n, edges[kept, 0] - 1, edges[kept, 1] - 1, edges[kept, 2])
+
+    @classmethod
+    def from_kruskal_lca(cls, engine):
+        """Same tree as a Kruskal_LCA engine (same roots), from its parent tables."""
+        return cls(list(engine.up[0]), list(engine.max_up[0]), list(engine.labels))
+
+    def index(self, node):
+        """Node number of a label (None if unknown)."""
+        if self.labels is None:
+            return node - 1 if isinstance(node, (int, np.integer)) and 1 <= node <= self.nb_nodes else None
+        return self.index_of.get(node)
+
+    def label(self, i):
+        """Label of a node number."""
+        if self.labels is None:
+            return i + 1
+        return self.labels[i]
+
+    def memory_usage(self):
+        """Number of bytes used by the arrays of the tree."""
+        arrays = [self.parent, self.parent_power, self.depth, self.component, self.euler, self.euler_depth,
+                  self.first, self.head, self.pos, self.segment] + self.sparse
+        return sum(a.itemsize*len(a) for a in arrays)
+
+    def lca(self, i, j):
+        """Lowest common ancestor of the nodes i and j (node numbers of the same tree), in O(1)."""
+        left, right = self.first[i], self.first[j]
+        if left > right:
+            left, right = right, left
+        k = (right - left + 1).bit_length() - 1
+        a = self.sparse[k][left]
+        b = self.sparse[k][right - (1 << k) + 1]
+        return self.euler[a] if self.euler_depth[a] <= self.euler_depth[b] else self.euler[b]
+
+    def _range_max(self, left, right):
+        """Maximum of the segment tree leaves left..right-1."""
+        segment = self.segment
+        best = 0
+        left += self.nb_nodes
+        right += self.nb_nodes
+        while left < right:
+            if left & 1:
+                if segment[left] > best:
+                    best = segment[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                if segment[right] > best:
+                    best = segment[right]
+            left >>= 1
+            right >>= 1
+        return best
+
+    def path_max(self, i, j):
+        """Maximal power on the path between the nodes i and j (node numbers of the same tree)."""
+        head, pos, depth, parent = self.head, self.pos, self.depth, self.parent
+        best = 0
+        while head[i] != head[j]:
+            if depth[head[i]] < depth[head[j]]:
+                i, j = j, i
+            # the whole chain of i, from its head to i, then the edge above the head
+            best = max(best, self._range_max(pos[head[i]], pos[i] + 1))
+            i = parent[head[i]]
+        if i != j:
+            if depth[i] > depth[j]:
+                i, j = j, i
+            best = max(best, self._range_max(pos[i] + 1, pos[j] + 1))
+        return best
+
+    def power(self, src, dest):
+        """Minimal power needed to go from src to dest, None if they are not connected (same as Kruskal_LCA.power)."""
+        i = self.index(src)
+        j = self.index(dest)
+        if i is None or j is None or self.component[i] != self.component[j]:
+            return None
+        return self.path_max(i, j)
+
+    def min_power(self, src, dest):
+        """Same output as Graph.min_power: (path, power) with the path of the tree, or (None, None)."""
+        power = self.power(src, dest)
+        if power is None:
+            return None, None
+        i, j = self.index(src), self.index(dest)
+        ancestor = self.lca(i, j)
+        path_src = [i]
+        while path_src[-1] != ancestor:
+            path_src.append(self.parent[path_src[-1]])
+        path_dest = []
+        while j != ancestor:
+            path_dest.append(j)
+            j = self.parent[j]
+        return [self.label(k) for k in path_src + path_dest[::-1]], power
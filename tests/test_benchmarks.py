@@ -0,0 +1,22 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from benchmarks import benchmark_graph, random_queries, synthetic_graph
+import unittest   # The test framework
+
+class Test_Benchmarks(unittest.TestCase):
+    def test_synthetic_graphs(self):
+        self.assertEqual(synthetic_graph("path", 100).nb_edges, 99)
+        self.assertEqual(synthetic_graph("star", 100).nb_edges, 99)
+        self.assertEqual(synthetic_graph("grid", 100).nb_edges, 180)
+        self.assertEqual(len(synthetic_graph("random", 100).connected_components()), 1)
+
+    def test_benchmark_graph(self):
+        g = synthetic_graph("random", 200)
+        result = benchmark_graph("random-200", lambda: g, random_queries(g, 50), memory=False)
+        self.assertEqual(result["nb_queries"], 50)
+        self.assertLessEqual(result["query_p50_us"], result["query_p99_us"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from generator import generate_network, generate_routes, load_binary_network
+from graph import graph_from_arrays, graph_from_file, read_routes_file
+import os
+import tempfile
+import unittest   # The test framework
+
+class Test_Generator(unittest.TestCase):
+    def test_network(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "network.x.in")
+            binary = os.path.join(folder, "network.x")
+            generate_network(filename, 500, 1200, binary=binary, seed=3, chunk_size=100, power="levels", skew=1.0)
+            g = graph_from_file(filename)
+            self.assertEqual((g.nb_nodes, g.nb_edges), (500, 1200))
+            self.assertEqual(len(g.connected_components()), 1)
+            self.assertLessEqual(len(g.distinct_powers()), 100)
+            n, edges = load_binary_network(binary)
+            self.assertEqual(graph_from_arrays(n, edges).graph, g.graph)
+            # same seed, same file
+            generate_network(filename + "2", 500, 1200, seed=3, chunk_size=100, power="levels", skew=1.0)
+            with open(filename) as a, open(filename + "2") as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_routes(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "routes.x.in")
+            generate_routes(filename, 50, 300, chunk_size=64)
+            routes = read_routes_file(filename)
+            self.assertEqual(len(routes), 300)
+            self.assertTrue(all(1 <= src <= 50 and 1 <= dest <= 50 for src, dest, _ in routes))
+
+if __name__ == '__main__':
+    unittest.main()
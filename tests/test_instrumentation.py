@@ -0,0 +1,50 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import graph
+from graph import Graph, graph_from_file, kruskal
+import instrumentation
+import unittest   # The test framework
+
+class Test_Instrumentation(unittest.TestCase):
+    def setUp(self):
+        instrumentation.reset()
+
+    def test_disabled_by_default(self):
+        bfs = Graph.bfs
+        g = graph_from_file("input/network.00.in")
+        g.min_power(1, 4)
+        self.assertIs(Graph.bfs, bfs)
+        self.assertEqual(instrumentation.stats, {})
+
+    def test_counters(self):
+        original = graph.graph_from_file
+        with instrumentation.instrumented():
+            self.assertIsNot(graph.graph_from_file, original)
+            g = graph_from_file("input/network.00.in")
+            g.get_path_with_power(1, 4, 11)
+            g.dfs(1)
+            kruskal(g)
+        self.assertIs(graph.graph_from_file, original)
+        report = instrumentation.report()
+        self.assertEqual(report["graph_from_file"]["calls"], 1)
+        self.assertEqual(report["Graph.dfs"]["work"], 10)
+        self.assertEqual(report["kruskal"]["work"], 9)
+        self.assertGreater(report["Disjoint_Set.union_index"]["calls"], 0)
+        self.assertGreater(report["Graph.bfs"]["calls"], 0)
+
+    def test_dfs_work_per_traversal(self):
+        # each dfs of connected_components counts only the nodes it visits, not the ones visited before
+        g = Graph(range(1, 7))
+        with instrumentation.instrumented():
+            g.connected_components()
+        self.assertEqual(instrumentation.report()["Graph.dfs"]["work"], g.nb_nodes)
+        instrumentation.reset()
+        g = graph_from_file("input/network.04.in")
+        with instrumentation.instrumented():
+            g.connected_components()
+        self.assertEqual(instrumentation.report()["Graph.dfs"]["work"], g.nb_nodes)
+
+if __name__ == '__main__':
+    unittest.main()
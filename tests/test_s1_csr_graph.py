@@ -0,0 +1,29 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file
+from csr_graph import CSR_Graph
+import unittest   # The test framework
+
+class Test_CSRGraph(unittest.TestCase):
+    def test_loading(self):
+        g = CSR_Graph.from_file("input/network.04.in")
+        self.assertEqual(g.nb_nodes, 10)
+        self.assertEqual(g.nb_edges, 4)
+        self.assertEqual(CSR_Graph.from_graph(graph_from_file("input/network.04.in")).nb_edges, 4)
+
+    def test_connected_components(self):
+        for g in (CSR_Graph.from_file("input/network.01.in"), CSR_Graph.from_graph(graph_from_file("input/network.01.in"))):
+            self.assertEqual(g.connected_components_set(), {frozenset({1, 2, 3}), frozenset({4, 5, 6, 7})})
+
+    def test_path_with_power(self):
+        g = CSR_Graph.from_file("input/network.00.in")
+        self.assertEqual(g.get_path_with_power(1, 4, 11), [1, 2, 3, 4])
+        self.assertEqual(g.get_path_with_power(1, 4, 10), None)
+        g = CSR_Graph.from_graph(graph_from_file("input/network.02.in"))
+        self.assertIn(g.get_path_with_power(1, 2, 11), [[1, 2], [1, 4, 3, 2]])
+        self.assertEqual(g.get_path_with_power(1, 2, 5), [1, 4, 3, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,5 +17,31 @@ class Test_GraphCC(unittest.TestCase):
         cc = g.connected_components_set()
         self.assertEqual(cc, {frozenset({1, 2, 3}), frozenset({4, 5, 6, 7})})
 
+    def test_component_ids(self):
+        g = graph_from_file("input/network.01.in")
+        ids = g.component_ids()
+        self.assertEqual(ids[1], ids[3])
+        self.assertNotEqual(ids[3], ids[4])
+        self.assertTrue(g.connected(4, 7))
+        self.assertFalse(g.connected(1, 7))
+        g.add_edge(3, 4, 1)
+        self.assertTrue(g.connected(1, 7))
+
+    def test_long_path(self):
+        # deeper than the recursion limit
+        n = 5 * sys.getrecursionlimit()
+        g = Graph(range(1, n + 1))
+        for node in range(1, n):
+            g.add_edge(node, node + 1, 1)
+        self.assertEqual(g.connected_components_set(), {frozenset(range(1, n + 1))})
+
+    def test_large_power(self):
+        # powers are not bounded: an edge above 10**9 still links its ends
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 2 * 10**9)
+        self.assertEqual(g.connected_components_set(), {frozenset([1, 2]), frozenset([3])})
+        self.assertTrue(g.connected(1, 2))
+        self.assertFalse(g.connected(1, 3))
+
 if __name__ == '__main__':
     unittest.main()
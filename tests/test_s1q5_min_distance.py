@@ -1 +1,32 @@
-# À compléter
\ No newline at end of file
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, read_routes_file
+import unittest   # The test framework
+
+class Test_ShortestMinPower(unittest.TestCase):
+    def test_tie_breaking(self):
+        # two paths with the same maximal power 5 from 1 to 4: the shortest one has to be chosen
+        g = Graph(range(1, 6))
+        g.add_edge(1, 2, 5, 10)
+        g.add_edge(2, 4, 5, 10)
+        g.add_edge(1, 3, 5, 3)
+        g.add_edge(3, 4, 2, 4)
+        g.add_edge(1, 4, 9, 1)
+        self.assertEqual(g.min_power_shortest_path(1, 4), ([1, 3, 4], 5, 7))
+        self.assertEqual(g.min_power_shortest_path(1, 5), (None, None, None))
+
+    def test_network04(self):
+        g = graph_from_file("input/network.04.in")
+        self.assertEqual(g.min_power_shortest_path(1, 4), ([1, 2, 3, 4], 4, 94))
+        self.assertEqual(sorted((min(a, b), max(a, b), p, d) for a, b, p, d in g.list_of_edges_with_dist()),
+                         [(1, 2, 4, 89), (1, 4, 11, 6), (2, 3, 4, 3), (3, 4, 4, 2)])
+
+    def test_batch(self):
+        g = graph_from_file("input/network.1.in")
+        routes = [(src, dest) for src, dest, _ in read_routes_file("input/routes.1.in")]
+        self.assertEqual(g.min_power_shortest_paths(routes), [g.min_power_shortest_path(src, dest) for src, dest in routes])
+
+if __name__ == '__main__':
+    unittest.main()
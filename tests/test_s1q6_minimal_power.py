@@ -2,7 +2,7 @@
 import sys 
 sys.path.append("delivery_network")
 
-from graph import graph_from_file
+from graph import Graph, graph_from_file
 import unittest   # The test framework
 
 class Test_MinimalPower(unittest.TestCase):
@@ -15,5 +15,37 @@ class Test_MinimalPower(unittest.TestCase):
         g = graph_from_file("input/network.04.in")
         self.assertEqual(g.min_power(1, 4)[1], 4)
 
+    def test_dijkstra(self):
+        g = graph_from_file("input/network.00.in")
+        self.assertEqual(g.min_power_dijkstra(1, 4), ([1, 2, 3, 4], 11))
+        self.assertEqual(g.min_power_dijkstra(2, 4)[1], 10)
+        self.assertEqual(g.min_power_dijkstra(1, 4, max_power=10), (None, None))
+        g = graph_from_file("input/network.04.in")
+        self.assertEqual(g.min_power_dijkstra(1, 4), ([1, 2, 3, 4], 4))
+        self.assertEqual(g.min_power_dijkstra(1, 5), (None, None))
+
+    def test_dijkstra_routes(self):
+        g = graph_from_file("input/network.1.in")
+        for src in range(1, 21):
+            for dest in range(1, 21):
+                path, power = g.min_power_dijkstra(src, dest)
+                self.assertEqual(power, g.min_power(src, dest)[1])
+                # every edge of the path can be used with this power
+                for a, b in zip(path, path[1:]):
+                    self.assertTrue(any(n == b and p <= power for n, p, _ in g.graph[a]))
+
+    def test_large_powers(self):
+        # powers above 10**9 must not be mistaken for missing edges
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 2 * 10**9)
+        self.assertEqual(g.min_power(1, 2), ([1, 2], 2 * 10**9))
+        self.assertEqual(g.min_power(1, 2), g.min_power_LCA(1, 2))
+        self.assertEqual(g.min_power(1, 3), (None, None))
+        g.add_edge(2, 3, 3 * 10**9)
+        g.add_edge(1, 3, 5 * 10**9)
+        for src, dest in [(1, 3), (3, 1), (2, 3)]:
+            self.assertEqual(g.min_power(src, dest)[1], g.min_power_LCA(src, dest)[1])
+            self.assertEqual(g.min_power(src, dest)[1], g.min_power_dijkstra(src, dest)[1])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,35 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, kruskal
+from boruvka import boruvka, boruvka_from_file
+import random
+import unittest   # The test framework
+
+def total_power(g):
+    return sum(power for _, _, power in g.list_of_edges)
+
+class Test_Boruvka(unittest.TestCase):
+    def test_same_total_power(self):
+        for filename in ["input/network.00.in", "input/network.01.in", "input/network.04.in", "input/network.1.in"]:
+            g = graph_from_file(filename)
+            mst = boruvka(g)
+            self.assertEqual(total_power(mst), total_power(kruskal(g)))
+            self.assertEqual(mst.nb_edges, kruskal(g).nb_edges)
+            n, edges = boruvka_from_file(filename)
+            self.assertEqual(int(edges[:, 2].sum()), total_power(mst))
+
+    def test_ties_and_loops(self):
+        rng = random.Random(2)
+        for _ in range(20):
+            g = Graph(range(1, 31))
+            for _ in range(60):
+                g.add_edge(rng.randint(1, 30), rng.randint(1, 30), rng.randint(1, 4))
+            mst = boruvka(g)
+            self.assertEqual(total_power(mst), total_power(kruskal(g)))
+            self.assertEqual(len(mst.connected_components()) + 30 - mst.nb_nodes,
+                             len(g.connected_components()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file, kruskal, Kruskal_LCA
+from cache import cache_folder, cached_graph_from_file, cached_kruskal, cached_kruskal_LCA
+import os
+import tempfile
+import unittest   # The test framework
+
+class Test_Cache(unittest.TestCase):
+    def test_graph(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for _ in range(2):
+                g = cached_graph_from_file("input/network.04.in", folder)
+                self.assertEqual(g.graph, graph_from_file("input/network.04.in").graph)
+            self.assertTrue(os.path.isdir(cache_folder("input/network.04.in", folder)))
+
+    def test_lca(self):
+        with tempfile.TemporaryDirectory() as folder:
+            engine = Kruskal_LCA(graph_from_file("input/network.1.in"))
+            for _ in range(2):
+                cached = cached_kruskal_LCA("input/network.1.in", folder)
+                for src in range(1, 21):
+                    for dest in range(1, 21):
+                        self.assertEqual(cached.min_power(src, dest), engine.min_power(src, dest))
+            mst = kruskal(graph_from_file("input/network.1.in"))
+            self.assertEqual(sorted(p for _, _, p in cached_kruskal("input/network.1.in", folder).list_of_edges),
+                             sorted(p for _, _, p in mst.list_of_edges))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, kruskal, Kruskal_LCA, Dynamic_MST
+import random
+import unittest   # The test framework
+
+class Test_DynamicMST(unittest.TestCase):
+    def test_swap(self):
+        g = graph_from_file("input/network.00.in")
+        mst = g.incremental_mst()
+        self.assertEqual(mst.power(1, 4), 11)
+        # 1-4 is cheaper than 1-2 (power 11): the edge of power 11 is swapped for it
+        g.add_edge(1, 4, 5)
+        self.assertEqual(mst.nb_swaps, 1)
+        self.assertEqual(mst.power(1, 4), 5)
+        self.assertEqual(g.min_power_LCA(1, 4), ([1, 4], 5))
+        # a useless edge changes nothing
+        self.assertFalse(mst.add_edge(2, 3, 100))
+
+    def test_link_and_new_nodes(self):
+        g = graph_from_file("input/network.04.in")
+        mst = Dynamic_MST(g)
+        self.assertIsNone(mst.power(1, 5))
+        self.assertTrue(mst.add_edge(4, 5, 3))
+        self.assertTrue(mst.add_edge(5, "new", 8))
+        self.assertEqual(mst.min_power(1, "new")[1], 8)
+
+    def test_random_insertions(self):
+        rng = random.Random(0)
+        n = 60
+        g = Graph(range(1, n + 1))
+        for _ in range(40):
+            g.add_edge(rng.randint(1, n), rng.randint(1, n), rng.randint(1, 50))
+        mst = g.incremental_mst()
+        for step in range(200):
+            g.add_edge(rng.randint(1, n), rng.randint(1, n), rng.randint(1, 50))
+            if step % 20 == 0:
+                self.assertEqual(mst.total_power(), sum(p for _, _, p in kruskal(g).list_of_edges))
+                engine = Kruskal_LCA(g)
+                for _ in range(30):
+                    src, dest = rng.randint(1, n), rng.randint(1, n)
+                    self.assertEqual(mst.power(src, dest), engine.power(src, dest))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file, graph_from_arrays, kruskal
+from external_kruskal import external_kruskal, iter_network_chunks
+import numpy as np
+import unittest   # The test framework
+
+class Test_ExternalKruskal(unittest.TestCase):
+    def total_power(self, filename):
+        return sum(power for _, _, power in kruskal(graph_from_file(filename)).list_of_edges)
+
+    def test_chunks(self):
+        chunks = list(iter_network_chunks("input/network.1.in", 30))
+        self.assertEqual([len(chunk) for chunk in chunks], [30, 30, 30, 10])
+        self.assertEqual(np.concatenate(chunks).shape, (100, 4))
+
+    def test_same_total_power(self):
+        for filename in ["input/network.00.in", "input/network.04.in", "input/network.1.in"]:
+            expected = self.total_power(filename)
+            for filter_chunks in (False, True):
+                n, mst = external_kruskal(filename, chunk_size=7, filter_chunks=filter_chunks)
+                self.assertEqual(int(mst[:, 2].sum()), expected)
+                self.assertEqual(len(graph_from_arrays(n, mst).connected_components()),
+                                 len(graph_from_file(filename).connected_components()))
+
+    def test_workers(self):
+        n, mst = external_kruskal("input/network.1.in", chunk_size=25, workers=2, filter_chunks=True)
+        self.assertEqual(len(mst), n - 1)
+        self.assertEqual(int(mst[:, 2].sum()), self.total_power("input/network.1.in"))
+
+if __name__ == '__main__':
+    unittest.main()
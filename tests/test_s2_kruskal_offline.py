@@ -0,0 +1,27 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file, kruskal_offline, read_routes_file, Kruskal_LCA
+import unittest   # The test framework
+
+class Test_KruskalOffline(unittest.TestCase):
+    def test_network0(self):
+        g = graph_from_file("input/network.00.in")
+        self.assertEqual(kruskal_offline(g, [(1, 4), (2, 4), (4, 4)]), [11, 10, 0])
+
+    def test_network1(self):
+        g = graph_from_file("input/network.04.in")
+        self.assertEqual(kruskal_offline(g, [(1, 4), (1, 5)]), [4, None])
+
+    def test_routes1(self):
+        g = graph_from_file("input/network.1.in")
+        queries = [(src, dest) for src, dest, _ in read_routes_file("input/routes.1.in")]
+        engine = Kruskal_LCA(g)
+        powers = kruskal_offline(g, queries)
+        self.assertEqual(powers, [engine.power(src, dest) for src, dest in queries])
+        # same results as the reference Graph.min_power
+        self.assertEqual(powers, [g.min_power(src, dest)[1] for src, dest in queries])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, read_routes_file, Kruskal_LCA, min_power_kruskal, min_power_kruskal_LCA
+import os
+import tempfile
+import unittest   # The test framework
+
+class Test_KruskalLCA(unittest.TestCase):
+    def test_network00(self):
+        g = graph_from_file("input/network.00.in")
+        engine = Kruskal_LCA(g)
+        self.assertEqual(engine.min_power(1, 4), ([1, 2, 3, 4], 11))
+        self.assertEqual(engine.power(2, 4), 10)
+        self.assertEqual(engine.power(3, 3), 0)
+
+    def test_network04(self):
+        g = graph_from_file("input/network.04.in")
+        self.assertEqual(min_power_kruskal_LCA(g, 1, 4), ([1, 2, 3, 4], 4))
+        self.assertEqual(g.min_power_LCA(1, 5), (None, None))
+
+    def test_min_power_kruskal(self):
+        g = graph_from_file("input/network.00.in")
+        self.assertEqual(min_power_kruskal(g, 1, 4), g.min_power(1, 4))
+        self.assertEqual(min_power_kruskal(graph_from_file("input/network.04.in"), 1, 5), (None, None))
+
+    def test_cache_reset_on_add_edge(self):
+        g = graph_from_file("input/network.01.in")
+        self.assertEqual(g.min_power_LCA(1, 4), (None, None))
+        g.add_edge(3, 4, 7)
+        self.assertEqual(g.min_power_LCA(1, 4), ([1, 2, 3, 4], 7))
+
+    def test_answer_routes(self):
+        g = graph_from_file("input/network.1.in")
+        engine = Kruskal_LCA(g)
+        with tempfile.TemporaryDirectory() as folder:
+            out_file = engine.answer_routes("input/routes.1.in", os.path.join(folder, "routes.1.out"))
+            with open(out_file) as out:
+                powers = [int(line) for line in out]
+        with open("input/routes.1.in") as routes:
+            queries = [tuple(map(int, line.split()[:2])) for line in routes.readlines()[1:]]
+        self.assertEqual(len(powers), len(queries))
+        for (src, dest), power in zip(queries, powers):
+            if src == dest:
+                self.assertEqual(power, 0)
+                continue
+            # the minimal power is the smallest power for which dest can be reached
+            self.assertIsNotNone(g.get_path_with_power(src, dest, power))
+            self.assertIsNone(g.get_path_with_power(src, dest, power - 1))
+
+    def test_stream_routes(self):
+        engine = Kruskal_LCA(graph_from_file("input/network.1.in"))
+        chunks = list(engine.stream_routes("input/routes.1.in", chunk_size=30))
+        self.assertEqual([len(chunk) for chunk in chunks], [30, 30, 30, 30, 20])
+        routes = read_routes_file("input/routes.1.in")
+        self.assertEqual(sum(chunks, []), [engine.power(src, dest) for src, dest, _ in routes])
+
+    def test_power_batch(self):
+        g = graph_from_file("input/network.1.in")
+        g.add_edge(30, 31, 7)
+        engine = Kruskal_LCA(g)
+        src = [src for src in range(1, 21) for _ in range(1, 21)] + [1, 30, 99]
+        dest = [dest for _ in range(1, 21) for dest in range(1, 21)] + [30, 31, 1]
+        expected = [engine.power(a, b) for a, b in zip(src, dest)]
+        self.assertEqual(engine.power_batch(src, dest).tolist(), [-1 if p is None else p for p in expected])
+
+    def test_power_batch_float(self):
+        # non integer powers are kept, not truncated
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 2.5)
+        g.add_edge(2, 3, 1.5)
+        engine = Kruskal_LCA(g)
+        self.assertEqual(engine.power(1, 3), 2.5)
+        self.assertEqual(engine.power_batch([1, 2, 1], [3, 3, 4]).tolist(), [2.5, 1.5, -1])
+
+    def test_answer_routes_batch(self):
+        engine = Kruskal_LCA(graph_from_file("input/network.1.in"))
+        with tempfile.TemporaryDirectory() as folder:
+            a = engine.answer_routes("input/routes.1.in", os.path.join(folder, "a.out"))
+            b = engine.answer_routes_batch("input/routes.1.in", os.path.join(folder, "b.out"))
+            with open(a) as file_a, open(b) as file_b:
+                self.assertEqual(file_a.read(), file_b.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, read_routes_arrays, Kruskal_LCA
+from oracle import Power_Oracle, oracle_dtype, oracle_memory
+import numpy as np
+import unittest   # The test framework
+
+class Test_PowerOracle(unittest.TestCase):
+    def test_dtype_and_memory(self):
+        self.assertEqual(oracle_dtype(200), np.uint8)
+        self.assertEqual(oracle_dtype(255), np.uint16)
+        self.assertEqual(oracle_dtype(10**6), np.uint32)
+        self.assertEqual(oracle_memory(20, 10**6), 1600)
+
+    def test_same_as_lca(self):
+        for filename in ["input/network.00.in", "input/network.04.in", "input/network.1.in"]:
+            g = graph_from_file(filename)
+            oracle = Power_Oracle(g)
+            self.assertIsNotNone(oracle.matrix)
+            engine = Kruskal_LCA(g)
+            for src in g.nodes:
+                for dest in g.nodes:
+                    self.assertEqual(oracle.power(src, dest), engine.power(src, dest))
+
+    def test_batch_and_fallback(self):
+        g = graph_from_file("input/network.1.in")
+        routes = read_routes_arrays("input/routes.1.in")
+        expected = Kruskal_LCA(g).power_batch(routes[:, 0], routes[:, 1])
+        oracle = Power_Oracle(g)
+        self.assertTrue(np.array_equal(oracle.power_batch(routes[:, 0], routes[:, 1]), expected))
+        small = Power_Oracle(g, memory_budget=100)
+        self.assertIsNone(small.matrix)
+        self.assertTrue(np.array_equal(small.power_batch(routes[:, 0], routes[:, 1]), expected))
+        self.assertEqual(small.power(1, 2), oracle.power(1, 2))
+
+    def test_batch_disconnected(self):
+        # network.04 has a node without edges, 999 is not a node
+        g = graph_from_file("input/network.04.in")
+        src = np.array([1, 1, 5, 999, 3, 4])
+        dest = np.array([4, 5, 5, 1, 2, 999])
+        expected = Kruskal_LCA(g).power_batch(src, dest)
+        self.assertIn(-1, expected.tolist())
+        self.assertEqual(Power_Oracle(g).power_batch(src, dest).tolist(), expected.tolist())
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 5)
+        self.assertEqual(Power_Oracle(g).power_batch([1, 1, 3], [2, 3, 3]).tolist(), [5, -1, 0])
+
+    def test_float_powers(self):
+        g = Graph([1, 2, 3, 4])
+        g.add_edge(1, 2, 2.5)
+        g.add_edge(2, 3, 1.5)
+        oracle = Power_Oracle(g)
+        self.assertEqual(oracle.power(1, 3), 2.5)
+        self.assertEqual(oracle.power_batch([1, 3, 1], [3, 2, 4]).tolist(), [2.5, 1.5, -1])
+        # the maximum is an integer but 1.5 must not be truncated either
+        g.add_edge(3, 4, 7)
+        oracle = Power_Oracle(g)
+        self.assertEqual(oracle.power(2, 3), 1.5)
+        self.assertEqual(oracle.power_batch([2, 1], [3, 4]).tolist(), Kruskal_LCA(g).power_batch([2, 1], [3, 4]).tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, Kruskal_LCA
+from parallel import answer_routes_parallel, attach_engine, share_tables
+import os
+import tempfile
+import unittest   # The test framework
+
+class Test_Parallel(unittest.TestCase):
+    def test_shared_tables(self):
+        engine = Kruskal_LCA(graph_from_file("input/network.1.in"))
+        block, args = share_tables(engine)
+        try:
+            shared_block, shared = attach_engine(*args)
+            for src in range(1, 21):
+                for dest in range(1, 21):
+                    self.assertEqual(shared.min_power(src, dest), engine.min_power(src, dest))
+            self.assertEqual(shared.power(1, 21), None)
+            del shared
+            shared_block.close()
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_shared_float_powers(self):
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 2.5)
+        g.add_edge(2, 3, 1.5)
+        engine = Kruskal_LCA(g)
+        block, args = share_tables(engine)
+        try:
+            shared_block, shared = attach_engine(*args)
+            self.assertEqual(shared.power(1, 3), 2.5)
+            self.assertEqual(shared.power(3, 2), 1.5)
+            del shared
+            shared_block.close()
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_same_output(self):
+        engine = Kruskal_LCA(graph_from_file("input/network.1.in"))
+        with tempfile.TemporaryDirectory() as folder:
+            expected = engine.answer_routes("input/routes.1.in", os.path.join(folder, "a.out"))
+            result = answer_routes_parallel(engine, "input/routes.1.in", os.path.join(folder, "b.out"),
+                                            workers=2, chunk_size=25)
+            with open(expected) as a, open(result) as b:
+                self.assertEqual(a.read(), b.read())
+
+if __name__ == '__main__':
+    unittest.main()
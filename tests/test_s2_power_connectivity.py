@@ -0,0 +1,32 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, Power_Connectivity
+import random
+import unittest   # The test framework
+
+class Test_PowerConnectivity(unittest.TestCase):
+    def test_network00(self):
+        g = graph_from_file("input/network.00.in")
+        index = Power_Connectivity(g)
+        self.assertTrue(index.is_reachable(1, 4, 11))
+        self.assertFalse(index.is_reachable(1, 4, 10))
+        self.assertTrue(index.is_reachable(3, 3, 0))
+        self.assertEqual(index.component_of(2, 10), index.component_of(4, 10))
+
+    def test_same_as_traversal(self):
+        rng = random.Random(1)
+        n = 50
+        g = Graph(range(1, n + 1))
+        for _ in range(70):
+            g.add_edge(rng.randint(1, n), rng.randint(1, n), rng.randint(1, 30))
+        index = g.connectivity_index()
+        for _ in range(500):
+            src, dest, power = rng.randint(1, n), rng.randint(1, n), rng.randint(0, 31)
+            self.assertEqual(index.is_reachable(src, dest, power), g.reachable_with_power(src, dest, power))
+        g.add_edge(1, 2, 1)
+        self.assertIsNot(g.connectivity_index(), index)
+
+if __name__ == '__main__':
+    unittest.main()
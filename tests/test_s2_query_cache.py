@@ -0,0 +1,41 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file, Query_Cache
+import unittest   # The test framework
+
+class Test_QueryCache(unittest.TestCase):
+    def test_symmetric_hits(self):
+        g = graph_from_file("input/network.00.in")
+        cache = g.cached_queries()
+        self.assertEqual(cache.min_power(1, 4), ([1, 2, 3, 4], 11))
+        self.assertEqual(cache.min_power(4, 1), ([4, 3, 2, 1], 11))
+        self.assertEqual(cache.power(1, 4), 11)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        g = graph_from_file("input/network.00.in")
+        cache = Query_Cache(g, maxsize=2, with_path=False)
+        cache.power(1, 2)
+        cache.power(1, 3)
+        cache.power(1, 2)
+        cache.power(1, 4)  # evicts (1, 3), the least recently used pair
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache.power(1, 2)
+        self.assertEqual(cache.hits, 2)
+        cache.power(1, 3)
+        self.assertEqual(cache.misses, 4)
+        self.assertRaises(ValueError, cache.min_power, 1, 2)
+
+    def test_invalidated_by_add_edge(self):
+        g = graph_from_file("input/network.01.in")
+        cache = g.cached_queries()
+        self.assertEqual(cache.min_power(1, 4), (None, None))
+        g.add_edge(3, 4, 7)
+        self.assertEqual(cache.stats()["size"], 0)
+        self.assertEqual(cache.min_power(1, 4), ([1, 2, 3, 4], 7))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, graph_from_file, Kruskal_LCA
+from rooted_tree import Rooted_Tree
+import random
+import unittest   # The test framework
+
+class Test_RootedTree(unittest.TestCase):
+    def test_network00(self):
+        tree = Rooted_Tree.from_file("input/network.00.in")
+        self.assertEqual(tree.min_power(1, 4), ([1, 2, 3, 4], 11))
+        self.assertEqual(tree.power(3, 3), 0)
+        self.assertIsNone(tree.power(1, 42))
+
+    def test_lca(self):
+        # 0 is the root, 1 and 2 its children, 3 and 4 below 1, 5 below 4
+        tree = Rooted_Tree([0, 0, 0, 1, 1, 4], [0, 5, 2, 7, 1, 3])
+        self.assertEqual(tree.lca(3, 5), 1)
+        self.assertEqual(tree.lca(5, 2), 0)
+        self.assertEqual(tree.lca(4, 5), 4)
+        self.assertEqual(tree.path_max(3, 5), 7)
+        self.assertEqual(tree.path_max(5, 2), 5)
+
+    def test_same_as_kruskal_lca(self):
+        rng = random.Random(3)
+        for _ in range(5):
+            g = Graph(range(1, 81))
+            for _ in range(120):
+                g.add_edge(rng.randint(1, 80), rng.randint(1, 80), rng.randint(1, 1000))
+            engine = Kruskal_LCA(g)
+            for tree in (Rooted_Tree.from_graph(g), Rooted_Tree.from_kruskal_lca(engine)):
+                for _ in range(300):
+                    src, dest = rng.randint(1, 80), rng.randint(1, 80)
+                    self.assertEqual(tree.power(src, dest), engine.power(src, dest))
+
+    def test_network1(self):
+        g = graph_from_file("input/network.1.in")
+        tree = Rooted_Tree.from_file("input/network.1.in")
+        engine = Kruskal_LCA(g)
+        for src in g.nodes:
+            for dest in g.nodes:
+                self.assertEqual(tree.power(src, dest), engine.power(src, dest))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import Graph, Disjoint_Set, kruskal
+import unittest   # The test framework
+
+class Test_DisjointSet(unittest.TestCase):
+    def test_union_find(self):
+        sets = Disjoint_Set(["a", "b", "c", "d"])
+        self.assertTrue(sets.union("a", "b"))
+        self.assertTrue(sets.union("c", "d"))
+        self.assertFalse(sets.union("b", "a"))
+        self.assertEqual(sets.find("a"), sets.find("b"))
+        self.assertNotEqual(sets.find("a"), sets.find("c"))
+        self.assertTrue(sets.union("b", "d"))
+        self.assertEqual(len({sets.find(node) for node in "abcd"}), 1)
+        self.assertEqual(max(sets.size), 4)
+
+    def test_kruskal_labels(self):
+        g = Graph(["x", "y", "z"])
+        g.add_edge("x", "y", 3)
+        g.add_edge("y", "z", 1)
+        g.add_edge("x", "z", 2)
+        mst = kruskal(g)
+        self.assertEqual(mst.nb_edges, 2)
+        self.assertEqual(sorted(power for _, _, power in mst.list_of_edges), [1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from allocation import TruckCatalog, route_candidates, allocate, upper_bound
+import numpy as np
+from graph import cw, allocation_from_files
+from itertools import combinations
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest   # The test framework
+
+def brute_force(items, budget):
+    best = 0
+    for size in range(len(items) + 1):
+        for chosen in combinations(items, size):
+            if sum(item[2] for item in chosen) <= budget:
+                best = max(best, sum(item[3] for item in chosen))
+    return best
+
+class Test_Allocation(unittest.TestCase):
+    def test_candidates(self):
+        # the truck of power 10 is dominated by the cheaper truck of power 20
+        items = route_candidates([5, 15, 25, None, 1], [100, 100, 100, 100, 5],
+                                 TruckCatalog([10, 20, 30], [50, 40, 80]))
+        self.assertEqual(items, [(0, 1, 40, 60), (1, 1, 40, 60), (2, 2, 80, 20)])
+
+    def test_candidates_float_power(self):
+        # a route needing 2.5 needs the truck of power 3, not the one of power 2
+        self.assertEqual(route_candidates([2.5], [100], TruckCatalog([2, 3], [1, 2])), [(0, 1, 2, 98)])
+        self.assertEqual(route_candidates([3.5, None], [100, 100], TruckCatalog([2, 3], [1, 2])), [])
+
+    def test_catalog(self):
+        catalog = TruckCatalog([10, 20, 30, 30, 40, 5], [50, 40, 80, 70, 70, 60])
+        # 10 (50) is dominated by 20 (40), 30 (80) by 30 (70), 30 (70) by 40 (70), 5 (60) by 20 (40)
+        self.assertEqual(catalog.powers, [20, 40])
+        self.assertEqual(catalog.indices, [1, 4])
+        self.assertEqual([catalog.cheapest(p) for p in (0, 20, 21, 40, 41)], [1, 1, 4, 4, None])
+        self.assertEqual(catalog.lookup(np.array([0, 20, 21, 40, 41])).tolist(), [1, 1, 4, 4, -1])
+
+    def test_methods(self):
+        random.seed(0)
+        for _ in range(30):
+            items = [(i, 0, random.randint(1, 50), random.randint(1, 60)) for i in range(10)]
+            budget = random.randint(1, 200)
+            best = brute_force(items, budget)
+            self.assertEqual(allocate(items, budget, "bnb")["profit"], best)
+            self.assertEqual(allocate(items, budget, "dp")["profit"], best)
+            greedy = allocate(items, budget, "greedy")
+            self.assertGreaterEqual(2 * greedy["profit"], best)
+            self.assertLessEqual(greedy["cost"], budget)
+            self.assertGreaterEqual(greedy["upper_bound"], best)
+
+    def test_scaled_dp(self):
+        random.seed(1)
+        items = [(i, 0, random.randint(10**6, 10**8), random.randint(1, 10**6)) for i in range(200)]
+        result = allocate(items, 10**9, "dp", memory_cap=2**16)
+        self.assertLessEqual(result["cost"], 10**9)
+        self.assertLessEqual(result["profit"], upper_bound(items, 10**9))
+        self.assertGreater(result["quality"], 0.9)
+
+    def test_scaled_dp_memory(self):
+        # few items and a huge budget: the DP arrays, not the table of choices, must fit in the cap
+        items = [(0, 0, 3 * 10**8, 10), (1, 0, 5 * 10**8, 7), (2, 0, 4 * 10**8, 9)]
+        tracemalloc.start()
+        try:
+            result = allocate(items, 10**9, "dp", memory_cap=2**20)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 2**20)
+        self.assertEqual(result["profit"], brute_force(items, 10**9))
+
+    def test_cw(self):
+        with tempfile.TemporaryDirectory() as folder:
+            trucks_file = os.path.join(folder, "trucks.0.in")
+            with open(trucks_file, "w") as trucks:
+                trucks.write("3\n5000 1000\n10000 3000\n20000 8000\n")
+            trucks_and_paths, profit = cw("input/network.1.in", trucks_file=trucks_file, Budget=100000)
+            result = allocation_from_files("input/network.1.in", trucks_file=trucks_file, Budget=100000, method="dp")
+        self.assertTrue(result["optimal"])
+        self.assertEqual(profit, result["profit"])
+        self.assertLessEqual(sum(truck[1] for truck, _ in trucks_and_paths), 100000)
+
+if __name__ == '__main__':
+    unittest.main()